@@ -43,6 +43,9 @@ class AppConfig:
     ocr_gpu_mem: int = 500
     ocr_cpu_threads: int = 10
     ocr_enable_mkldnn: bool = True
+    # TensorRT en GPU; precision (fp32 | fp16 | int8) solo se pasa a Paddle con TensorRT
+    ocr_use_tensorrt: bool = False
+    ocr_precision: str = "fp32"
     ocr_det_db_thresh: float = 0.3
     ocr_det_db_box_thresh: float = 0.5
     ocr_det_db_unclip_ratio: float = 1.6
@@ -63,6 +66,7 @@ class AppConfig:
     # Configuración de exportación Excel
     excel_default_filename: str = "texto_extraido.xlsx"
     excel_sheet_name: str = "Texto Extraído"
+    excel_backend: str = "openpyxl"  # "openpyxl" | "xlsxwriter" (más rápido en tablas grandes)
     excel_include_metadata: bool = True
     excel_include_confidence: bool = True
     excel_auto_adjust_columns: bool = True
@@ -127,6 +131,12 @@ class AppConfig:
         if self.max_image_size_mb < 1:
             raise ValueError("max_image_size_mb debe ser mayor que 0")
 
+        if self.ocr_precision not in ("fp32", "fp16", "int8"):
+            raise ValueError("ocr_precision debe ser 'fp32', 'fp16' o 'int8'")
+
+        if self.excel_backend not in ("openpyxl", "xlsxwriter"):
+            raise ValueError("excel_backend debe ser 'openpyxl' o 'xlsxwriter'")
+
     def _adjust_paths(self):
         """Ajustar rutas relativas a absolutas."""
         # Convertir directorio de logs a ruta absoluta
@@ -142,6 +152,8 @@ class AppConfig:
             'gpu_mem': self.ocr_gpu_mem,
             'cpu_threads': self.ocr_cpu_threads,
             'enable_mkldnn': self.ocr_enable_mkldnn,
+            'use_tensorrt': self.ocr_use_tensorrt,
+            'precision': self.ocr_precision,
             'det_db_thresh': self.ocr_det_db_thresh,
             'det_db_box_thresh': self.ocr_det_db_box_thresh,
             'det_db_unclip_ratio': self.ocr_det_db_unclip_ratio,
@@ -168,6 +180,7 @@ class AppConfig:
         return {
             'filename': self.excel_default_filename,
             'sheet_name': self.excel_sheet_name,
+            'backend': self.excel_backend,
             'include_metadata': self.excel_include_metadata,
             'include_confidence': self.excel_include_confidence,
             'auto_adjust_columns': self.excel_auto_adjust_columns,
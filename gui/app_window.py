@@ -8,6 +8,8 @@ para procesar imágenes y generar archivos Excel.
 from __future__ import annotations
 import sys
 import logging
+import queue
+import stat
 from pathlib import Path
 from typing import Optional
 
@@ -16,44 +18,72 @@ from PyQt5.QtWidgets import (
     QPushButton, QLabel, QFileDialog, QProgressBar, QTextEdit,
     QMessageBox, QFrame, QSpacerItem, QSizePolicy
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
-from PyQt5.QtGui import QFont, QPixmap, QIcon
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from PyQt5.QtGui import QFont
 
 from config import AppConfig
 from image2excel.use_cases import RunImageToExcel, RunImageToExcelConfig
-from image2excel.adapters import PaddleOcrAdapter, BasicParserAdapter, OpenpyxlExporterAdapter
+
+
+_STOP = object()  # centinela de fin para la cola del worker
+
+# Estilos de las etiquetas de imagen/destino, construidos una sola vez
+_LABEL_STYLE_DEFAULT = "color: #666; font-style: italic;"
+_LABEL_STYLE_SELECTED = "color: #1E88E5; font-weight: bold;"
 
 
 class OCRWorker(QThread):
-    """Worker thread para procesar OCR sin bloquear la UI."""
+    """Worker thread para procesar OCR sin bloquear la UI.
+
+    Vive lo mismo que la ventana: las conversiones se encolan con `enqueue` y
+    se procesan en orden; `stop` termina el bucle tras la tarea en curso.
+    """
 
     finished = pyqtSignal(str)  # Ruta del archivo Excel generado
     error = pyqtSignal(str)     # Mensaje de error
     progress = pyqtSignal(int)  # Progreso (0-100)
     log_message = pyqtSignal(str)  # Mensaje de log para mostrar en UI
 
-    def __init__(self, image_path: str, output_dir: str, config: AppConfig):
+    def __init__(self, config: AppConfig):
         super().__init__()
-        self.image_path = image_path
-        self.output_dir = output_dir
         self.config = config
+        self._tasks: "queue.Queue" = queue.Queue()
+
+    def enqueue(self, image_path: str, output_dir: str) -> None:
+        """Encola una conversión (arranca el hilo la primera vez)."""
+        self._tasks.put((image_path, output_dir))
+        if not self.isRunning():
+            self.start()
+
+    def stop(self) -> None:
+        """Pide al hilo que termine cuando acabe la tarea en curso."""
+        self._tasks.put(_STOP)
 
     def run(self):
-        """Ejecuta el procesamiento OCR en un hilo separado."""
+        """Atiende la cola de conversiones hasta recibir el centinela."""
+        while (task := self._tasks.get()) is not _STOP:
+            self.process(*task)
+
+    def process(self, image_path: str, output_dir: str):
+        """Ejecuta una conversión OCR completa (en el hilo del worker)."""
         try:
             self.log_message.emit("🔍 Iniciando validación de archivos...")
             self.progress.emit(5)
 
             # Validar archivo de imagen
-            image_path = Path(self.image_path)
-            if not image_path.exists():
-                raise FileNotFoundError(f"La imagen no existe: {self.image_path}")
+            # (un solo stat: existencia y tipo salen del mismo resultado)
+            source = image_path
+            image_path = Path(source)
+            try:
+                image_stat = image_path.stat()
+            except FileNotFoundError:
+                raise FileNotFoundError(f"La imagen no existe: {source}")
 
-            if not image_path.is_file():
-                raise ValueError(f"La ruta no es un archivo válido: {self.image_path}")
+            if not stat.S_ISREG(image_stat.st_mode):
+                raise ValueError(f"La ruta no es un archivo válido: {source}")
 
             # Validar directorio de salida
-            output_dir = Path(self.output_dir)
+            output_dir = Path(output_dir)
             if not output_dir.exists():
                 self.log_message.emit(f"📁 Creando directorio de salida: {output_dir}")
                 output_dir.mkdir(parents=True, exist_ok=True)
@@ -61,10 +91,16 @@ class OCRWorker(QThread):
             self.log_message.emit("✅ Validación de archivos completada")
             self.progress.emit(10)
 
-            # Construir caso de uso
+            # Construir caso de uso (adaptadores importados aquí: openpyxl y los
+            # servicios OCR no se cargan hasta el primer procesamiento)
             self.log_message.emit("🔧 Inicializando componentes OCR...")
+            from image2excel.adapters import PaddleOcrAdapter, BasicParserAdapter, OpenpyxlExporterAdapter
+
             try:
-                ocr = PaddleOcrAdapter()
+                ocr = PaddleOcrAdapter(
+                    use_tensorrt=self.config.ocr_use_tensorrt,
+                    precision=self.config.ocr_precision,
+                )
                 self.log_message.emit("✅ Adaptador OCR inicializado")
             except Exception as e:
                 raise RuntimeError(f"Error al inicializar OCR: {e}")
@@ -76,7 +112,7 @@ class OCRWorker(QThread):
                 raise RuntimeError(f"Error al inicializar parser: {e}")
 
             try:
-                exporter = OpenpyxlExporterAdapter()
+                exporter = OpenpyxlExporterAdapter(backend=self.config.excel_backend)
                 self.log_message.emit("✅ Exportador Excel inicializado")
             except Exception as e:
                 raise RuntimeError(f"Error al inicializar exportador: {e}")
@@ -89,7 +125,7 @@ class OCRWorker(QThread):
             self.log_message.emit("⚙️ Configurando parámetros de procesamiento...")
 
             # Generar nombre de archivo basado en la imagen
-            image_name = Path(self.image_path).stem  # Nombre sin extensión
+            image_name = image_path.stem  # Nombre sin extensión
             excel_filename = f"imagen_a_excel_{image_name}.xlsx"
 
             config = RunImageToExcelConfig(
@@ -113,11 +149,12 @@ class OCRWorker(QThread):
                 self.log_message.emit("✅ Procesamiento OCR completado exitosamente")
                 self.progress.emit(80)
 
-                # Verificar que el archivo se creó
-                if not output_path.exists():
+                # Verificar que el archivo se creó (y su tamaño, con el mismo stat)
+                try:
+                    file_size = output_path.stat().st_size
+                except FileNotFoundError:
                     raise FileNotFoundError(f"El archivo Excel no se generó: {output_path}")
 
-                file_size = output_path.stat().st_size
                 self.log_message.emit(f"📊 Archivo Excel generado: {file_size} bytes")
                 self.progress.emit(100)
 
@@ -142,12 +179,19 @@ class ImageToExcelApp(QMainWindow):
         self.config = AppConfig()
         self.selected_image_path: Optional[str] = None
         self.selected_output_dir: Optional[str] = None
-        self.worker: Optional[OCRWorker] = None
+        self.converting = False
         self.last_output_dir: Optional[str] = None  # Para recordar el último directorio usado
 
         self.init_ui()
         self.apply_styles()
 
+        # Worker único para toda la sesión: señales conectadas una sola vez
+        self.worker = OCRWorker(self.config)
+        self.worker.finished.connect(self.on_conversion_finished)
+        self.worker.error.connect(self.on_conversion_error)
+        self.worker.progress.connect(self.progress_bar.setValue)
+        self.worker.log_message.connect(self.on_log_message)
+
         # Ajustar el tamaño de la ventana al contenido
         self.adjustSize()
 
@@ -236,7 +280,7 @@ class ImageToExcelApp(QMainWindow):
         h_layout.addWidget(self.select_image_button)
 
         self.image_label = QLabel("Ninguna imagen seleccionada")
-        self.image_label.setStyleSheet("color: #666; font-style: italic;")
+        self.image_label.setStyleSheet(_LABEL_STYLE_DEFAULT)
         h_layout.addWidget(self.image_label, 1)
 
         layout.addLayout(h_layout)
@@ -264,7 +308,7 @@ class ImageToExcelApp(QMainWindow):
         h_layout.addWidget(self.select_output_button)
 
         self.output_label = QLabel("Directorio actual")
-        self.output_label.setStyleSheet("color: #666; font-style: italic;")
+        self.output_label.setStyleSheet(_LABEL_STYLE_DEFAULT)
         h_layout.addWidget(self.output_label, 1)
 
         layout.addLayout(h_layout)
@@ -329,6 +373,12 @@ class ImageToExcelApp(QMainWindow):
 
         self.setStyleSheet(style)
 
+    @staticmethod
+    def _set_label_style(label: QLabel, style: str) -> None:
+        """Aplica `style` solo si cambia (cada setStyleSheet re-parsea el CSS)."""
+        if label.styleSheet() != style:
+            label.setStyleSheet(style)
+
     def select_image(self):
         """Abre diálogo para seleccionar imagen."""
         file_dialog = QFileDialog()
@@ -343,18 +393,19 @@ class ImageToExcelApp(QMainWindow):
                 self.selected_image_path = files[0]
                 image_name = Path(self.selected_image_path).name
                 self.image_label.setText(f"📄 {image_name}")
-                self.image_label.setStyleSheet("color: #1E88E5; font-weight: bold;")
+                self._set_label_style(self.image_label, _LABEL_STYLE_SELECTED)
 
                 # Log informativo (solo si el log_text está inicializado)
                 if hasattr(self, 'log_text') and self.log_text is not None:
                     self.log_text.append(f"📁 Imagen seleccionada: {image_name}")
 
-                    # Verificar que el archivo existe y es válido
-                    if Path(self.selected_image_path).exists():
+                    # Verificar que el archivo existe y es válido (un solo stat)
+                    try:
                         file_size = Path(self.selected_image_path).stat().st_size
-                        self.log_text.append(f"   ✅ Archivo válido ({file_size} bytes)")
+                    except OSError:
+                        self.log_text.append("   ❌ Error: El archivo no existe")
                     else:
-                        self.log_text.append(f"   ❌ Error: El archivo no existe")
+                        self.log_text.append(f"   ✅ Archivo válido ({file_size} bytes)")
 
                 # Actualizar estado del botón de forma segura
                 self.update_convert_button_state()
@@ -373,7 +424,7 @@ class ImageToExcelApp(QMainWindow):
             self.last_output_dir = directory  # Guardar para la próxima vez
             dir_name = Path(directory).name
             self.output_label.setText(f"📁 {dir_name}")
-            self.output_label.setStyleSheet("color: #1E88E5; font-weight: bold;")
+            self._set_label_style(self.output_label, _LABEL_STYLE_SELECTED)
 
             # Log informativo (solo si el log_text está inicializado)
             if hasattr(self, 'log_text') and self.log_text is not None:
@@ -418,9 +469,10 @@ class ImageToExcelApp(QMainWindow):
             return
 
         # Verificar que no hay otro proceso en ejecución
-        if self.worker and self.worker.isRunning():
+        if self.converting:
             self.log_text.append("⚠️ Ya hay un proceso en ejecución. Espere a que termine.")
             return
+        self.converting = True
 
         # Deshabilitar botones durante procesamiento
         self.convert_button.setEnabled(False)
@@ -442,17 +494,8 @@ class ImageToExcelApp(QMainWindow):
         self.log_text.append(f"🌐 Idioma: {self.config.ocr_language}")
         self.log_text.append("")
 
-        # Crear y ejecutar worker
-        self.worker = OCRWorker(
-            self.selected_image_path,
-            self.selected_output_dir,
-            self.config
-        )
-        self.worker.finished.connect(self.on_conversion_finished)
-        self.worker.error.connect(self.on_conversion_error)
-        self.worker.progress.connect(self.progress_bar.setValue)
-        self.worker.log_message.connect(self.on_log_message)
-        self.worker.start()
+        # Encolar en el worker de la sesión
+        self.worker.enqueue(self.selected_image_path, self.selected_output_dir)
 
     def on_log_message(self, message: str):
         """Maneja mensajes de log del worker."""
@@ -464,6 +507,7 @@ class ImageToExcelApp(QMainWindow):
 
     def on_conversion_finished(self, excel_path: str):
         """Maneja la finalización exitosa de la conversión."""
+        self.converting = False
         self.progress_bar.setVisible(False)
         self.log_text.append("")
         self.log_text.append("=" * 50)
@@ -488,6 +532,7 @@ class ImageToExcelApp(QMainWindow):
 
     def on_conversion_error(self, error_message: str):
         """Maneja errores durante la conversión."""
+        self.converting = False
         self.progress_bar.setVisible(False)
         self.log_text.append("")
         self.log_text.append("=" * 50)
@@ -517,9 +562,15 @@ class ImageToExcelApp(QMainWindow):
 
     def closeEvent(self, event):
         """Maneja el cierre de la aplicación."""
-        if self.worker and self.worker.isRunning():
-            self.worker.terminate()
-            self.worker.wait()
+        if self.worker.isRunning():
+            self.worker.stop()
+            if not self.worker.wait(2000):  # OCR en curso: no esperar a que acabe
+                self.worker.terminate()
+                self.worker.wait()
+        # Liberar los motores OCR compartidos, solo si llegaron a cargarse
+        adapters = sys.modules.get("image2excel.adapters")
+        if adapters is not None:
+            adapters.release_ocr_services()
         event.accept()
 
 
@@ -6,11 +6,12 @@ Sin dependencia de services.parser: parser básico embebido aquí.
 
 from __future__ import annotations
 from pathlib import Path
-from typing import Iterable, List
+from typing import Any, Iterable, List
 
 from .ports import OcrEngine, TableParser, ExcelExporter, OcrWord, Table, TableRow
 
 # OCR ligero (pytesseract + PIL; sin cv2).
+from services.instance_cache import InstanceCache
 from services.paddle_ocr import PaddleOcrService  # usa este servicio ya corregido
 
 # Exportador a Excel (openpyxl)
@@ -19,9 +20,26 @@ from services.exporter import ExcelExporter as ExcelExporterImpl
 
 # -------------------------- OCR Adapter --------------------------
 
+# Servicios OCR compartidos por idioma y opciones: el modelo se carga una vez por proceso
+# y no en cada conversión (la GUI crea un adaptador nuevo por imagen).
+_OCR_SERVICES: InstanceCache[PaddleOcrService] = InstanceCache()
+
+
+def _get_ocr_service(lang_default: str, **service_kwargs: Any) -> PaddleOcrService:
+    key = (lang_default, tuple(sorted(service_kwargs.items())))
+    return _OCR_SERVICES.get(key, lambda: PaddleOcrService(lang_default, **service_kwargs))
+
+
+def release_ocr_services() -> None:
+    """Cierra y olvida los servicios OCR compartidos (llamar al cerrar la aplicación)."""
+    for svc in _OCR_SERVICES.clear():
+        svc.close()
+
+
 class PaddleOcrAdapter(OcrEngine):
-    def __init__(self, lang_default: str = "es") -> None:
-        self._svc = PaddleOcrService(lang_default)
+    def __init__(self, lang_default: str = "es", **service_kwargs: Any) -> None:
+        # service_kwargs: opciones de PaddleOcrService (p.ej. use_tensorrt, precision)
+        self._svc = _get_ocr_service(lang_default, **service_kwargs)
 
     def extract_words(self, image_path: Path, lang: str) -> List[OcrWord]:
         result = self._svc.extract_words(str(image_path), lang=lang)
@@ -51,8 +69,9 @@ class BasicParserAdapter(TableParser):
         if not items:
             return Table(rows=[])
 
-        # Orden global por Y, luego X
-        items.sort(key=lambda t: (t.y, t.x))
+        # Orden global por centro vertical, luego X: una palabra alta (empieza más
+        # arriba) queda alineada con el resto de su fila
+        items.sort(key=lambda t: (t.y + t.h // 2, t.x))
 
         # Umbral de agrupación vertical basado en altura media
         avg_h = max(1, int(sum(t.h for t in items) / len(items)))
@@ -60,13 +79,18 @@ class BasicParserAdapter(TableParser):
 
         rows: list[list[OcrWord]] = []
         current: list[OcrWord] = [items[0]]
+        # Cada palabra se compara con la anterior (encadenado): una fila inclinada
+        # sigue unida aunque acumule deriva. Ordenadas por centro: diferencia >= 0.
+        last_cy = items[0].y + items[0].h // 2
 
         for w in items[1:]:
-            if abs(w.y - current[-1].y) <= y_threshold:
+            cy = w.y + w.h // 2
+            if cy - last_cy <= y_threshold:
                 current.append(w)
             else:
                 rows.append(sorted(current, key=lambda t: t.x))
                 current = [w]
+            last_cy = cy
         rows.append(sorted(current, key=lambda t: t.x))
 
         # Convierte a TableRow
@@ -85,8 +109,8 @@ class BasicParserAdapter(TableParser):
 # ----------------------- Exporter Adapter ------------------------
 
 class OpenpyxlExporterAdapter(ExcelExporter):
-    def __init__(self) -> None:
-        self._svc = ExcelExporterImpl()
+    def __init__(self, backend: str = "openpyxl") -> None:
+        self._svc = ExcelExporterImpl(backend=backend)
 
     def export(self, table: Table, output_dir: Path, filename: str) -> Path:
         # Pasamos el objeto Table directamente, porque services/exporter.py valida table.rows
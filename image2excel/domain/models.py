@@ -1,31 +1,83 @@
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterable, List, Optional
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Cell:
     text: str
     confidence: Optional[float] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TableRow:
     cells: List[Cell]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True, init=False)
 class Table:
-    rows: List[TableRow]
+    """Tabla en formato columnar: rejilla de textos + confianzas paralelas opcionales.
 
+    `grid[r][c]` es el texto de la celda; `confidences`, si existe, tiene la misma
+    forma. Por compatibilidad se acepta `Table(rows=[TableRow(...)])`, y `rows`
+    devuelve la vista `TableRow`/`Cell`, que se construye en el primer acceso y
+    se reutiliza después (no refleja cambios posteriores sobre `grid`).
+    """
 
-@dataclass(frozen=True)
+    grid: List[List[str]]
+    confidences: Optional[List[List[Optional[float]]]]
+    _rows: Optional[List[TableRow]] = field(repr=False, compare=False)
+
+    def __init__(
+        self,
+        grid: Optional[List[List[str]]] = None,
+        confidences: Optional[List[List[Optional[float]]]] = None,
+        *,
+        rows: Optional[Iterable[TableRow]] = None,
+    ) -> None:
+        if rows is not None:
+            if grid is not None or confidences is not None:
+                raise TypeError("Table acepta grid/confidences o rows, no ambos")
+            rows = list(rows)
+            grid = [[cell.text for cell in row.cells] for row in rows]
+            if any(cell.confidence is not None for row in rows for cell in row.cells):
+                confidences = [[cell.confidence for cell in row.cells] for row in rows]
+        elif grid is None:
+            raise TypeError("Table necesita grid o rows")
+        object.__setattr__(self, "grid", grid)
+        object.__setattr__(self, "confidences", confidences)
+        object.__setattr__(self, "_rows", rows)
+
+    @classmethod
+    def from_grid(
+        cls,
+        grid: List[List[str]],
+        confidences: Optional[List[List[Optional[float]]]] = None,
+    ) -> "Table":
+        return cls(grid=grid, confidences=confidences)
+
+    @property
+    def rows(self) -> List[TableRow]:
+        """Vista de compatibilidad como filas de `Cell` (se cachea tras el primer acceso)."""
+        if self._rows is None:
+            if self.confidences is None:
+                rows = [TableRow(cells=[Cell(text=t) for t in row]) for row in self.grid]
+            else:
+                rows = [
+                    TableRow(cells=[Cell(text=t, confidence=c) for t, c in zip(row, confs)])
+                    for row, confs in zip(self.grid, self.confidences)
+                ]
+            object.__setattr__(self, "_rows", rows)
+        return self._rows
+
+
+@dataclass(frozen=True, slots=True)
 class OcrResult:
     text: str
     table: Optional[Table] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ExportResult:
     output_path: Path
@@ -1,5 +1,22 @@
 """Excel export adapters for image2excel application."""
 
-from .openpyxl_exporter import OpenpyxlExcelExporter
+from __future__ import annotations
 
-__all__ = ["OpenpyxlExcelExporter"]
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .openpyxl_exporter import OpenpyxlExcelExporter
+    from .xlsxwriter_exporter import XlsxwriterExcelExporter
+
+__all__ = ["OpenpyxlExcelExporter", "XlsxwriterExcelExporter"]
+
+
+def __getattr__(name: str):
+    # Import diferido (PEP 562): openpyxl/xlsxwriter solo se cargan al usar el adaptador
+    if name == "OpenpyxlExcelExporter":
+        from .openpyxl_exporter import OpenpyxlExcelExporter
+        return OpenpyxlExcelExporter
+    if name == "XlsxwriterExcelExporter":
+        from .xlsxwriter_exporter import XlsxwriterExcelExporter
+        return XlsxwriterExcelExporter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
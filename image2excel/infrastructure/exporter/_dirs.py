@@ -0,0 +1,15 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Set
+
+# Carpetas ya creadas en este proceso: en lotes grandes casi todas las
+# exportaciones van al mismo directorio y basta con un mkdir por carpeta.
+_ENSURED_DIRS: Set[Path] = set()
+
+
+def ensure_parent_dir(output_path: Path) -> None:
+    """Crea (una sola vez por proceso) la carpeta padre de `output_path`."""
+    parent = output_path.parent
+    if parent not in _ENSURED_DIRS:
+        parent.mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(parent)
@@ -1,26 +1,26 @@
 from __future__ import annotations
 from pathlib import Path
 from openpyxl import Workbook
-from ...domain.models import Table, ExportResult, Cell, TableRow
+from ...domain.models import Table, ExportResult
 from ...domain.ports import ExcelExporter
+from ._dirs import ensure_parent_dir
 
 
 class OpenpyxlExcelExporter(ExcelExporter):
     """Adaptador concreto para exportar tablas a Excel usando Openpyxl."""
 
     def export_table(self, table: Table, output_path: Path) -> ExportResult:
-        if not table.rows:
+        if not table.grid:
             raise ValueError("Tabla vacía: no hay filas que exportar.")
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Texto Extraído"
+        # Modo write-only: las filas se vuelcan al .xlsx sin mantener el árbol de celdas
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Texto Extraído")
 
-        for r_idx, row in enumerate(table.rows, start=1):
-            for c_idx, cell in enumerate(row.cells, start=1):
-                ws.cell(row=r_idx, column=c_idx, value=cell.text)
+        for row in table.grid:
+            ws.append(row)
 
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        ensure_parent_dir(output_path)
         wb.save(output_path.as_posix())
 
         return ExportResult(output_path=output_path)
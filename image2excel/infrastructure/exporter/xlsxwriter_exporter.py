@@ -0,0 +1,37 @@
+from __future__ import annotations
+from pathlib import Path
+import xlsxwriter  # type: ignore
+from ...domain.models import Table, ExportResult
+from ...domain.ports import ExcelExporter
+from ._dirs import ensure_parent_dir
+
+
+class XlsxwriterExcelExporter(ExcelExporter):
+    """Adaptador alternativo a Openpyxl usando xlsxwriter en modo memoria constante.
+
+    Solo escribe texto plano, por lo que desactiva la conversión automática de
+    cadenas a fórmulas/URLs/números.
+    """
+
+    def export_table(self, table: Table, output_path: Path) -> ExportResult:
+        if not table.grid:
+            raise ValueError("Tabla vacía: no hay filas que exportar.")
+
+        ensure_parent_dir(output_path)
+        wb = xlsxwriter.Workbook(
+            output_path.as_posix(),
+            {
+                "constant_memory": True,
+                "strings_to_formulas": False,
+                "strings_to_urls": False,
+                "strings_to_numbers": False,
+            },
+        )
+        try:
+            ws = wb.add_worksheet("Texto Extraído")
+            for r_idx, row in enumerate(table.grid):
+                ws.write_row(r_idx, 0, row)
+        finally:
+            wb.close()
+
+        return ExportResult(output_path=output_path)
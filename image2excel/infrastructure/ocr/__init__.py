@@ -1,6 +1,22 @@
 """OCR adapters for image2excel application."""
 
-from .paddle_table_detector import PaddleTableDetector
-from .paddle_ocr_engine import PaddleOcrEngine
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .paddle_table_detector import PaddleTableDetector
+    from .paddle_ocr_engine import PaddleOcrEngine
 
 __all__ = ["PaddleTableDetector", "PaddleOcrEngine"]
+
+
+def __getattr__(name: str):
+    # Import diferido (PEP 562): cada adaptador se carga al primer acceso
+    if name == "PaddleTableDetector":
+        from .paddle_table_detector import PaddleTableDetector
+        return PaddleTableDetector
+    if name == "PaddleOcrEngine":
+        from .paddle_ocr_engine import PaddleOcrEngine
+        return PaddleOcrEngine
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
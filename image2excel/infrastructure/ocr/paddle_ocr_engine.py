@@ -1,7 +1,14 @@
 from __future__ import annotations
-from typing import Optional
+import os
+from typing import Any, Optional, Tuple
 from ...domain.models import OcrResult, Table
 from ...domain.ports import OcrEngine, TableDetector
+from services.instance_cache import InstanceCache
+from services.paddle_ocr import onnx_model_kwargs
+
+# Motores PaddleOCR compartidos por proceso, clave (lang, use_angle_cls, modelos ONNX):
+# la carga de modelos cuesta segundos y no debe repetirse por instancia.
+_PADDLE_CACHE: InstanceCache[Any] = InstanceCache()
 
 
 class PaddleOcrEngine(OcrEngine):
@@ -13,10 +20,12 @@ class PaddleOcrEngine(OcrEngine):
         self._ocr = None  # lazy
 
     def _ensure_ocr(self) -> None:
-        if self._ocr is None:
-            from paddleocr import PaddleOCR  # type: ignore
-            # `use_angle_cls=True` mejora textos inclinados; ajusta `lang` si quieres "es"
-            self._ocr = PaddleOCR(use_angle_cls=True, lang=self._lang, show_log=False)
+        if self._ocr is not None:
+            return
+        # I2E_ONNX_MODEL_DIR: carpeta con det.onnx/rec.onnx/cls.onnx -> ONNX Runtime
+        onnx_dir = os.getenv("I2E_ONNX_MODEL_DIR") or None
+        key: Tuple[str, bool, Optional[str]] = (self._lang, True, onnx_dir)
+        self._ocr = _PADDLE_CACHE.get(key, lambda: _new_paddle(self._lang, onnx_dir))
 
     def run_ocr(self, image: "Image") -> OcrResult:
         self._ensure_ocr()
@@ -26,7 +35,7 @@ class PaddleOcrEngine(OcrEngine):
         lines = []
         if result and isinstance(result, list):
             for page in result:
-                for _, (txt, _score) in page:
+                for _, (txt, _score) in page or ():
                     if txt:
                         lines.append(txt)
 
@@ -40,3 +49,17 @@ class PaddleOcrEngine(OcrEngine):
                 table = None
 
         return OcrResult(text=text, table=table)
+
+
+def _new_paddle(lang: str, onnx_dir: Optional[str]) -> Any:
+    from paddleocr import PaddleOCR  # type: ignore
+    # `use_angle_cls=True` mejora textos inclinados; ajusta `lang` si quieres "es".
+    # MKL-DNN (oneDNN) + todos los núcleos: backend acelerado de CPU en PaddleOCR 2.x.
+    return PaddleOCR(
+        use_angle_cls=True,
+        lang=lang,
+        show_log=False,
+        enable_mkldnn=True,
+        cpu_threads=os.cpu_count() or 1,
+        **onnx_model_kwargs(onnx_dir),
+    )
@@ -1,8 +1,48 @@
 from __future__ import annotations
-from typing import Optional, List, Tuple
-from ...domain.models import Table, TableRow, Cell
+import io
+import re
+import threading
+from typing import Any, Optional, List, Tuple
+
+import numpy as np
+
+from ...domain.models import Table
 from ...domain.ports import TableDetector
 
+# Patrones del parseo naive, compilados una sola vez
+_TR_RE = re.compile(r"<tr[^>]*>(.*?)</tr>", re.IGNORECASE | re.DOTALL)
+_TD_RE = re.compile(r"<t[dh][^>]*>(.*?)</t[dh]>", re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r"<[^>]+>")
+_EMPTY = ""  # celda vacía compartida
+
+# TableSystem de PP-Structure compartido por proceso (carga de modelos costosa)
+_TABLE_SYS: Optional[Any] = None
+_TABLE_SYS_LOCK = threading.Lock()
+
+# Conversión de imagen: PIL y OpenCV son opcionales, se resuelven una sola vez
+try:
+    from PIL import Image as PILImage
+except Exception:
+    PILImage = None  # type: ignore[assignment]
+
+try:
+    import cv2  # type: ignore
+except Exception:
+    cv2 = None  # type: ignore[assignment]
+
+# Parsers HTML opcionales: se prueban una sola vez al cargar el módulo
+try:
+    from selectolax.lexbor import LexborHTMLParser  # type: ignore
+    _HAS_SELECTOLAX = True
+except Exception:
+    _HAS_SELECTOLAX = False
+
+try:
+    from lxml import etree as lxml_etree  # type: ignore
+    _HAS_LXML = True
+except Exception:
+    _HAS_LXML = False
+
 # PP-Structure usa PaddleOCR internamente
 # Evitamos el import global para no romper si no está instalada.
 class PaddleTableDetector(TableDetector):
@@ -13,36 +53,31 @@ class PaddleTableDetector(TableDetector):
     """
 
     def __init__(self) -> None:
-        # Config por defecto de PP-Structure orientada a tablas.
-        # El TableSystem de PaddleOCR devuelve HTML estructurado (<table><tr><td>).
-        from paddleocr.ppstructure.table.predict_table import TableSystem  # type: ignore
-
-        # model_type="structure" usa un pipeline que detecta la estructura de la tabla
-        # sin necesidad de OCR de texto si no quieres (pero lo hace).
-        self._table_sys = TableSystem(table_model_dir=None)  # usa modelos por defecto
+        self._table_sys = _get_table_system()
 
     def detect_table(self, image: "Image", ocr_text: str) -> Optional[Table]:
         """
         Ejecuta table recognition. Convierte el HTML y/o celdas detectadas
         a nuestro modelo Table. Si no detecta estructura, retorna None.
         """
-        import numpy as np
-
         # Convertimos imagen PIL/OpenCV a ndarray (PP-Structure espera ndarrays BGR)
-        if hasattr(image, "to_ndarray"):  # por si fuese un wrapper
+        if isinstance(image, np.ndarray):  # camino rápido: frame OpenCV (BGR)
+            nd = image if image.flags.c_contiguous else np.ascontiguousarray(image)
+        elif hasattr(image, "to_ndarray"):  # por si fuese un wrapper
             nd = image.to_ndarray()
         elif hasattr(image, "numpy"):  # por si fuese un tensor
             nd = image.numpy()
+        elif PILImage is not None and isinstance(image, PILImage.Image):
+            if image.mode != "RGB":
+                image = image.convert("RGB")
+            rgb = np.asarray(image)
+            if cv2 is not None:
+                # Una sola pasada con salida contigua (evita vista invertida + copia)
+                nd = cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+            else:
+                nd = np.ascontiguousarray(rgb[:, :, ::-1])
         else:
-            try:
-                # Si es PIL
-                from PIL import Image as PILImage
-                if isinstance(image, PILImage.Image):
-                    nd = np.array(image)[:, :, ::-1]  # RGB -> BGR
-                else:
-                    nd = np.array(image)
-            except Exception:
-                nd = np.array(image)
+            nd = np.asarray(image)
 
         res = self._table_sys(nd)
 
@@ -58,43 +93,84 @@ class PaddleTableDetector(TableDetector):
         # Parseo HTML simple para construir filas y celdas en orden visual
         # Nota: esto no almacena "colspan/rowspan". Si quieres merges POR EXCEL
         # podrías extender el modelo para guardarlos.
-        try:
-            from bs4 import BeautifulSoup  # lightweight, pero si no quieres dependencia, parsea a mano
-        except Exception as e:
-            # Sin BeautifulSoup, intentamos un parseo básico
-            return self._parse_html_naive(html)
+        # Orden de preferencia: selectolax (lexbor) -> lxml -> regex naive.
+        if _HAS_SELECTOLAX:
+            return self._parse_html_selectolax(html)
+        if _HAS_LXML:
+            return self._parse_html_lxml(html)
+        return self._parse_html_naive(html)
 
-        soup = BeautifulSoup(html, "html.parser")
-        rows: List[TableRow] = []
-        for tr in soup.find_all("tr"):
-            cells = []
-            for td in tr.find_all(["td", "th"]):
-                text = (td.get_text() or "").strip()
-                cells.append(Cell(text=text or ""))
+    # --- Backends de parseo HTML ---
+    def _parse_html_selectolax(self, html: str) -> Optional[Table]:
+        tree = LexborHTMLParser(html)
+        grid: List[List[str]] = []
+        for tr in tree.css("tr"):
+            cells = [td.text(deep=True).strip() for td in tr.css("td, th")]
             if cells:
-                rows.append(TableRow(cells=cells))
+                grid.append(cells)
+        if not grid:
+            return None
+        return Table.from_grid(grid)
+
+    def _parse_html_lxml(self, html: str) -> Optional[Table]:
+        # Parseo en streaming: cada <tr> se procesa al cerrarse y se libera en el
+        # acto, así la memoria no crece con el tamaño de la tabla.
+        grid: List[List[str]] = []
+        try:
+            for _, tr in lxml_etree.iterparse(
+                io.BytesIO(html.encode("utf-8")),
+                events=("end",),
+                tag="tr",
+                html=True,
+                encoding="utf-8",
+            ):
+                cells = [_lxml_cell_text(td) for td in tr if td.tag in ("td", "th")]
+                if cells:
+                    grid.append(cells)
+                tr.clear()
+                while tr.getprevious() is not None:
+                    del tr.getparent()[0]
+        except Exception:
+            # HTML vacío o demasiado roto para lxml
+            return self._parse_html_naive(html)
 
-        if not rows:
+        if not grid:
             return None
-        return Table(rows=rows)
+        return Table.from_grid(grid)
 
-    # --- Auxiliar sin BeautifulSoup (naive) ---
+    # --- Auxiliar sin selectolax ni lxml (naive) ---
     def _parse_html_naive(self, html: str) -> Optional[Table]:
         # Muy básico: separar por <tr> y <td>
-        import re
-
-        tr_blocks = re.findall(r"<tr[^>]*>(.*?)</tr>", html, flags=re.IGNORECASE | re.DOTALL)
-        rows: List[TableRow] = []
-        for block in tr_blocks:
-            tds = re.findall(r"<t[dh][^>]*>(.*?)</t[dh]>", block, flags=re.IGNORECASE | re.DOTALL)
-            cells = [Cell(text=self._strip_tags(td)) for td in tds]
+        grid: List[List[str]] = []
+        for block in _TR_RE.findall(html):
+            cells = [self._strip_tags(td) for td in _TD_RE.findall(block)]
             if cells:
-                rows.append(TableRow(cells=cells))
-        if not rows:
+                grid.append(cells)
+        if not grid:
             return None
-        return Table(rows=rows)
+        return Table.from_grid(grid)
 
     def _strip_tags(self, s: str) -> str:
-        import re
-        s = re.sub(r"<[^>]+>", "", s)
+        s = _TAG_RE.sub("", s)
         return " ".join(s.split())
+
+
+def _lxml_cell_text(td: Any) -> str:
+    """Texto de una celda lxml; la mayoría son un único nodo de texto sin hijos."""
+    txt = td.text if (td.text and not len(td)) else "".join(td.itertext())
+    return txt.strip() if txt else _EMPTY
+
+
+def _get_table_system() -> Any:
+    """Devuelve el TableSystem del proceso, creándolo en la primera llamada."""
+    global _TABLE_SYS
+    with _TABLE_SYS_LOCK:
+        if _TABLE_SYS is None:
+            # Config por defecto de PP-Structure orientada a tablas.
+            # El TableSystem de PaddleOCR devuelve HTML estructurado (<table><tr><td>).
+            from paddleocr.ppstructure.table.predict_table import TableSystem  # type: ignore
+
+            # model_type="structure" usa un pipeline que detecta la estructura de la tabla
+            # sin necesidad de OCR de texto si no quieres (pero lo hace).
+            _TABLE_SYS = TableSystem(table_model_dir=None)  # usa modelos por defecto
+        return _TABLE_SYS
@@ -10,7 +10,7 @@ from pathlib import Path
 from typing import Iterable, Protocol
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OcrWord:
     text: str
     confidence: float
@@ -20,12 +20,12 @@ class OcrWord:
     h: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TableRow:
     cells: list[str]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Table:
     rows: list[TableRow]
 
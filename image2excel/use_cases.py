@@ -2,8 +2,11 @@
 """Application layer: casos de uso atómicos."""
 
 from __future__ import annotations
+import queue
+import threading
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Callable, Iterable
 
 from .ports import OcrEngine, TableParser, ExcelExporter
 
@@ -28,3 +31,96 @@ class RunImageToExcel:
         table = self._parser.words_to_table(words, cfg.max_cols)
         xlsx_path = self._exporter.export(table, output_dir, cfg.output_filename)
         return xlsx_path
+
+
+_DONE = object()  # centinela de fin de etapa
+
+
+class RunImagesToExcel:
+    """Caso de uso por lotes: varias imágenes -> OCR -> tabla -> Excel.
+
+    Las tres etapas (OCR, parseo, exportación) corren en hilos distintos unidos
+    por colas acotadas, de modo que el OCR de la imagen siguiente avanza mientras
+    se parsea/exporta la anterior. Cada imagen genera `<stem>_<output_filename>`.
+    """
+
+    def __init__(
+        self,
+        ocr: OcrEngine,
+        parser: TableParser,
+        exporter: ExcelExporter,
+        queue_size: int = 4,
+    ) -> None:
+        self._ocr = ocr
+        self._parser = parser
+        self._exporter = exporter
+        self._queue_size = max(1, queue_size)
+
+    def __call__(
+        self, image_paths: Iterable[Path], output_dir: Path, cfg: RunImageToExcelConfig
+    ) -> list[Path]:
+        words_q: queue.Queue = queue.Queue(maxsize=self._queue_size)
+        tables_q: queue.Queue = queue.Queue(maxsize=self._queue_size)
+        errors: list[BaseException] = []
+
+        def ocr_stage() -> None:
+            try:
+                for path in image_paths:
+                    if errors:
+                        break
+                    path = Path(path)
+                    words_q.put((path, self._ocr.extract_words(path, cfg.lang)))
+            except BaseException as e:  # se relanza en el hilo llamante
+                errors.append(e)
+            finally:
+                words_q.put(_DONE)
+
+        def parse_stage(item: tuple) -> tuple:
+            path, words = item
+            return path, self._parser.words_to_table(words, cfg.max_cols)
+
+        threads = [
+            threading.Thread(target=ocr_stage, name="i2e-ocr", daemon=True),
+            threading.Thread(
+                target=_run_stage, args=(parse_stage, words_q, tables_q, errors),
+                name="i2e-parse", daemon=True,
+            ),
+        ]
+        for t in threads:
+            t.start()
+
+        outputs: list[Path] = []
+        while (item := tables_q.get()) is not _DONE:
+            if errors:
+                continue  # drenar para no bloquear a las etapas previas
+            path, table = item
+            try:
+                filename = f"{path.stem}_{cfg.output_filename}"
+                outputs.append(self._exporter.export(table, output_dir, filename))
+            except BaseException as e:
+                errors.append(e)
+
+        for t in threads:
+            t.join()
+        if errors:
+            raise errors[0]
+        return outputs
+
+
+def _run_stage(
+    fn: Callable[[tuple], tuple],
+    inbox: queue.Queue,
+    outbox: queue.Queue,
+    errors: list[BaseException],
+) -> None:
+    """Consume `inbox` aplicando `fn` y publica en `outbox` hasta el centinela."""
+    try:
+        while (item := inbox.get()) is not _DONE:
+            if errors:
+                continue  # drenar para no bloquear a la etapa previa
+            try:
+                outbox.put(fn(item))
+            except BaseException as e:
+                errors.append(e)
+    finally:
+        outbox.put(_DONE)
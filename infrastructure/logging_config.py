@@ -14,7 +14,11 @@ import logging.handlers
 import os
 import sys
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
+
+# Argumentos de la última llamada a configure_logging: repetirla con los
+# mismos argumentos no vuelve a crear handlers ni a abrir ficheros.
+_CONFIGURED_WITH: Optional[Tuple[Any, ...]] = None
 
 
 class LoggingConfig:
@@ -133,7 +137,19 @@ def configure_logging(
         Directorio para archivos de log
     **kwargs : Any
         Parámetros adicionales para LoggingConfig
+
+    Notes
+    -----
+    Es idempotente: una segunda llamada con los mismos argumentos no hace nada
+    mientras los handlers instalados sigan en el logger raíz.
     """
+    global _CONFIGURED_WITH
+
+    signature = (level, log_to_file, log_to_console, log_dir, tuple(sorted(kwargs.items())))
+    root_logger = logging.getLogger()
+    if signature == _CONFIGURED_WITH and root_logger.handlers:
+        return
+
     config = LoggingConfig(
         level=level,
         log_to_file=log_to_file,
@@ -143,7 +159,6 @@ def configure_logging(
     )
 
     # Limpiar handlers existentes
-    root_logger = logging.getLogger()
     root_logger.handlers.clear()
 
     # Configurar nivel del logger raíz
@@ -160,6 +175,8 @@ def configure_logging(
     # Configurar loggers específicos para librerías externas
     _configure_external_loggers(level)
 
+    _CONFIGURED_WITH = signature
+
     # Log de inicio
     root_logger.info("Sistema de logging configurado correctamente")
     root_logger.info("Nivel de logging: %s", logging.getLevelName(level))
@@ -2,30 +2,97 @@
 """
 Script de instalación automática de dependencias para I2E.
 Maneja la instalación de todas las librerías necesarias y resuelve problemas comunes.
+
+Uso: python install_dependencies.py [--clear-cache]
 """
 
+import hashlib
+import importlib.metadata
+import importlib.util
+import itertools
 import subprocess
 import sys
 import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Opciones comunes a todas las instalaciones: preferir wheels (sin compilar
+# sdists) y no esperar nunca a una entrada interactiva.
+PIP_INSTALL = [sys.executable, "-m", "pip", "install", "--prefer-binary", "--no-input"]
+
+# uv (instalador compilado, resuelve e instala en paralelo) si está en el PATH
+UV = shutil.which("uv")
+
+def pip_cmd():
+    """Prefijo argv para instalar paquetes: `uv pip install` o, si no hay uv, pip."""
+    if UV:
+        return [UV, "pip", "install", "--python", sys.executable]
+    return list(PIP_INSTALL)
+
+# Caché HTTP/wheels de pip local al proyecto: sobrevive a venvs nuevos y se
+# puede montar/cachear en CI. Un PIP_CACHE_DIR ya definido tiene prioridad.
+PIP_CACHE_DIR = os.environ.get("PIP_CACHE_DIR") or str(Path(__file__).resolve().parent / ".pip-cache")
+
+# Entorno de pip: sin la consulta HTTP de versión en cada invocación, con un
+# timeout de red acotado y la caché del proyecto (también para uv).
+PIP_ENV = {
+    **os.environ,
+    "PIP_DISABLE_PIP_VERSION_CHECK": "1",
+    "PIP_DEFAULT_TIMEOUT": os.environ.get("PIP_DEFAULT_TIMEOUT", "60"),
+    "PIP_CACHE_DIR": PIP_CACHE_DIR,
+    "UV_CACHE_DIR": os.environ.get("UV_CACHE_DIR") or os.path.join(PIP_CACHE_DIR, "uv"),
+}
+
+# Caché de instalaciones completadas: una firma por (script, intérprete).
+# Si la firma ya está registrada se salta pip y solo se verifica.
+CACHE_FILE = Path.home() / ".i2e_deps_cache"
+
+# Wheelhouse local de PaddlePaddle/PaddleOCR (cientos de MB): se descarga una
+# vez y los reintentos con otras versiones se resuelven desde disco.
+# Dentro del proyecto (junto a .pip-cache) y no en /tmp: se instala desde aquí
+# con --no-index, así que no puede estar en un directorio compartido entre usuarios.
+WHEELHOUSE = Path(__file__).resolve().parent / ".wheelhouse"
+
+# Lock opcional con versiones y hashes (ver install_locked_dependencies)
+LOCK_FILE = Path(__file__).resolve().parent / "requirements.lock"
+
+# Versión mínima de pip aceptada sin actualizar
+MIN_PIP = "23.0"
+
 def run_command(command, description):
-    """Ejecutar comando y mostrar resultado."""
+    """Ejecutar comando (lista argv, sin shell) mostrando su salida en vivo."""
     print(f"\n🔧 {description}...")
-    print(f"Comando: {command}")
+    print(f"Comando: {subprocess.list2cmdline(command)}")
 
+    # Salida línea a línea según llega: progreso visible y sin acumular en memoria
+    # los logs completos de pip. stderr va al mismo flujo para conservar el orden.
+    # Cada línea lleva la descripción: los grupos en paralelo escriben a la vez.
+    prefix = f"   │ [{description}] "
     try:
-        result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
-        print(f"✅ {description} completado exitosamente")
-        if result.stdout:
-            print(f"Salida: {result.stdout.strip()}")
-        return True
-    except subprocess.CalledProcessError as e:
+        proc = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+            env=PIP_ENV,
+        )
+    except OSError as e:
         print(f"❌ Error en {description}: {e}")
-        if e.stderr:
-            print(f"Error: {e.stderr.strip()}")
         return False
 
+    with proc:
+        for line in proc.stdout:
+            print(f"{prefix}{line}", end="", flush=True)
+
+    if proc.returncode != 0:
+        print(f"❌ Error en {description}: código de salida {proc.returncode}")
+        return False
+
+    print(f"✅ {description} completado exitosamente")
+    return True
+
 def check_python_version():
     """Verificar versión de Python."""
     version = sys.version_info
@@ -48,13 +115,49 @@ def check_pip():
         print("❌ Error: pip no está disponible")
         return False
 
+def version_tuple(version):
+    """'23.2.1' -> (23, 2, 1); ignora sufijos no numéricos ('24.0b1' -> (24, 0))."""
+    parts = []
+    for part in version.split("."):
+        digits = "".join(itertools.takewhile(str.isdigit, part))
+        if not digits:
+            break
+        parts.append(int(digits))
+    return tuple(parts)
+
 def upgrade_pip():
-    """Actualizar pip a la última versión."""
+    """Actualizar pip a la última versión si la instalada es anterior a MIN_PIP."""
+    try:
+        current = importlib.metadata.version("pip")
+    except importlib.metadata.PackageNotFoundError:
+        current = "0"
+    if version_tuple(current) >= version_tuple(MIN_PIP):
+        print(f"\n✅ pip {current} ya es reciente (>= {MIN_PIP}), no se actualiza")
+        return True
+
     return run_command(
-        f"{sys.executable} -m pip install --upgrade pip",
+        [*PIP_INSTALL, "--upgrade", "pip"],
         "Actualizando pip"
     )
 
+def install_locked_dependencies():
+    """Instalar básicas + PaddleOCR desde requirements.lock con hashes verificados.
+
+    El lock se genera con `pip-compile --generate-hashes requirements.txt
+    -o requirements.lock` (pip-tools). Resolución determinista: las
+    reinstalaciones salen enteras de la caché de pip.
+
+    Devuelve None si no hay lock (se usa la instalación por grupos), o el
+    resultado de la instalación.
+    """
+    if not LOCK_FILE.is_file():
+        return None
+    print(f"\n🔒 Instalando desde {LOCK_FILE.name} (versiones fijadas con hash)...")
+    return run_command(
+        [*pip_cmd(), "--require-hashes", "-r", str(LOCK_FILE)],
+        f"Instalando dependencias de {LOCK_FILE.name}",
+    )
+
 def install_basic_dependencies():
     """Instalar dependencias básicas con versiones compatibles."""
     print("\n📦 Instalando dependencias básicas con versiones compatibles...")
@@ -67,10 +170,10 @@ def install_basic_dependencies():
         "openpyxl>=3.1.0"
     ]
 
-    for package in compatible_packages:
-        if not run_command(f"{sys.executable} -m pip install {package}", f"Instalando {package}"):
-            print(f"❌ Error al instalar {package}")
-            return False
+    # Una sola invocación de pip: resuelve y descarga todo el grupo de una vez
+    if not run_command([*pip_cmd(), *compatible_packages], "Instalando dependencias básicas"):
+        print("❌ Error al instalar las dependencias básicas")
+        return False
 
     return True
 
@@ -78,25 +181,31 @@ def install_pyqt5():
     """Instalar PyQt5 con manejo de errores."""
     print("\n🎨 Instalando PyQt5...")
 
+    # Cualquier binding Qt ya presente sirve: no hace falta lanzar pip
+    for gui_module in ("PyQt5", "PySide2", "PySide6"):
+        if importlib.util.find_spec(gui_module) is not None:
+            print(f"✅ {gui_module} ya instalado")
+            return True
+
     # Intentar instalación estándar
-    if run_command(f"{sys.executable} -m pip install PyQt5", "Instalando PyQt5"):
+    if run_command([*pip_cmd(), "PyQt5"], "Instalando PyQt5"):
         return True
 
     print("⚠️  PyQt5 falló, intentando alternativas...")
 
     # Alternativa 1: Solo binarios
-    if run_command(f"{sys.executable} -m pip install PyQt5 --only-binary=all", "Instalando PyQt5 (solo binarios)"):
+    if run_command([*pip_cmd(), "PyQt5", "--only-binary=:all:"], "Instalando PyQt5 (solo binarios)"):
         return True
 
     # Alternativa 2: PySide2
     print("🔄 Intentando con PySide2 como alternativa...")
-    if run_command(f"{sys.executable} -m pip install PySide2", "Instalando PySide2"):
+    if run_command([*pip_cmd(), "PySide2"], "Instalando PySide2"):
         print("✅ PySide2 instalado. La aplicación funcionará con esta alternativa.")
         return True
 
     # Alternativa 3: PySide6
     print("🔄 Intentando con PySide6 como alternativa...")
-    if run_command(f"{sys.executable} -m pip install PySide6", "Instalando PySide6"):
+    if run_command([*pip_cmd(), "PySide6"], "Instalando PySide6"):
         print("✅ PySide6 instalado. La aplicación funcionará con esta alternativa.")
         return True
 
@@ -107,43 +216,36 @@ def install_paddleocr():
     """Instalar PaddleOCR con manejo de errores."""
     print("\n🤖 Instalando PaddleOCR...")
 
-    # Instalar PaddlePaddle primero - versión compatible
-    print("📦 Instalando PaddlePaddle...")
-    paddlepaddle_commands = [
-        "paddlepaddle>=2.5.1",
-        "paddlepaddle",
-        "paddlepaddle==2.5.2"
-    ]
-
-    paddlepaddle_installed = False
-    for cmd in paddlepaddle_commands:
-        if run_command(f"{sys.executable} -m pip install {cmd}", f"Instalando PaddlePaddle ({cmd})"):
-            paddlepaddle_installed = True
-            break
-
-    if not paddlepaddle_installed:
-        print("❌ No se pudo instalar PaddlePaddle")
-        return False
-
-    # Instalar PaddleOCR
-    print("📦 Instalando PaddleOCR...")
-    paddleocr_commands = [
-        "paddleocr>=2.6.0",
-        "paddleocr",
-        "paddleocr==2.7.0"
-    ]
+    if importlib.util.find_spec("paddleocr") is not None and importlib.util.find_spec("paddle") is not None:
+        print("✅ PaddlePaddle y PaddleOCR ya instalados")
+        return True
 
-    paddleocr_installed = False
-    for cmd in paddleocr_commands:
-        if run_command(f"{sys.executable} -m pip install {cmd}", f"Instalando PaddleOCR ({cmd})"):
-            paddleocr_installed = True
-            break
+    # Intento principal: descargar PaddlePaddle + PaddleOCR (y dependencias) al
+    # wheelhouse con una sola invocación e instalar desde ahí sin índice. Los
+    # rangos dejan que el resolver elija versión en una sola pasada.
+    paddle_packages = ["paddlepaddle>=2.5.1,<3", "paddleocr>=2.6.0,<3"]
+    WHEELHOUSE.mkdir(parents=True, exist_ok=True)
+    if run_command(
+        [sys.executable, "-m", "pip", "download", "--prefer-binary", "--no-input",
+         "--dest", str(WHEELHOUSE), *paddle_packages],
+        "Descargando PaddlePaddle y PaddleOCR",
+    ) and run_command(
+        [*pip_cmd(), "--no-index", "--find-links", str(WHEELHOUSE), *paddle_packages],
+        "Instalando PaddlePaddle y PaddleOCR",
+    ):
+        return True
 
-    if not paddleocr_installed:
-        print("❌ No se pudo instalar PaddleOCR")
-        return False
+    # Un único reintento con versiones fijadas conocidas; reutiliza lo ya
+    # descargado y solo va a la red por lo que falte.
+    print("⚠️  Instalación conjunta fallida, probando versiones fijadas...")
+    if run_command(
+        [*pip_cmd(), "--find-links", str(WHEELHOUSE), "paddlepaddle==2.5.2", "paddleocr==2.7.0"],
+        "Instalando PaddlePaddle y PaddleOCR (versiones fijadas)",
+    ):
+        return True
 
-    return True
+    print("❌ No se pudo instalar PaddlePaddle/PaddleOCR")
+    return False
 
 def install_dev_dependencies():
     """Instalar dependencias de desarrollo (opcionales)."""
@@ -155,11 +257,8 @@ def install_dev_dependencies():
 
     print("\n🛠️  Instalando dependencias de desarrollo...")
 
-    for dep in dev_deps:
-        try:
-            run_command(f"{sys.executable} -m pip install {dep}", f"Instalando {dep}")
-        except:
-            print(f"⚠️  {dep} no se pudo instalar (opcional)")
+    if not run_command([*pip_cmd(), *dev_deps], "Instalando dependencias de desarrollo"):
+        print("⚠️  Las dependencias de desarrollo no se pudieron instalar (opcionales)")
 
     return True
 
@@ -167,53 +266,83 @@ def verify_installation():
     """Verificar que todas las dependencias estén instaladas."""
     print("\n🔍 Verificando instalación...")
 
-    required_modules = [
-        ("cv2", "OpenCV"),
-        ("PIL", "Pillow"),
-        ("numpy", "NumPy"),
-        ("openpyxl", "OpenPyXL")
-    ]
-
-    # Verificar módulos básicos
-    for module, name in required_modules:
-        try:
-            __import__(module)
-            print(f"✅ {name} disponible")
-        except ImportError:
+    # Módulo -> nombre de cada dependencia obligatoria. Se comprueba el módulo
+    # importable y no la distribución pip: opencv-python-headless/contrib y
+    # paddlepaddle-gpu proporcionan los mismos módulos. find_spec resuelve el
+    # loader sin ejecutarlo (importar paddleocr cargaría cientos de MB nativos).
+    required = {
+        "cv2": "OpenCV",
+        "PIL": "Pillow",
+        "numpy": "NumPy",
+        "openpyxl": "OpenPyXL",
+        "paddle": "PaddlePaddle",  # paddlepaddle o paddlepaddle-gpu
+        "paddleocr": "PaddleOCR",
+    }
+    for module, name in required.items():
+        if importlib.util.find_spec(module) is None:
             print(f"❌ {name} no disponible")
             return False
+        print(f"✅ {name} disponible")
 
-    # Verificar interfaz gráfica
-    gui_available = False
-    for gui_module in ["PyQt5", "PySide2", "PySide6"]:
-        try:
-            __import__(gui_module)
-            print(f"✅ {gui_module} disponible")
-            gui_available = True
-            break
-        except ImportError:
-            continue
-
-    if not gui_available:
+    # Verificar interfaz gráfica (cualquiera de las alternativas vale)
+    gui_module = next(
+        (m for m in ("PyQt5", "PySide2", "PySide6") if importlib.util.find_spec(m) is not None),
+        None,
+    )
+    if gui_module is None:
         print("❌ Ninguna interfaz gráfica disponible")
         return False
+    print(f"✅ {gui_module} disponible")
+
+    print("\n🎉 ¡Todas las dependencias están instaladas correctamente!")
+    return True
 
-    # Verificar PaddleOCR
+def install_signature():
+    """Firma del conjunto de dependencias de este script para este intérprete."""
+    digest = hashlib.sha256(Path(__file__).read_bytes())
+    digest.update(sys.executable.encode())
+    digest.update(sys.version.encode())
+    return digest.hexdigest()
+
+def is_install_cached(signature):
+    """Comprobar si la firma ya consta como instalada."""
     try:
-        import paddleocr
-        print("✅ PaddleOCR disponible")
-    except ImportError:
-        print("❌ PaddleOCR no disponible")
+        return signature in CACHE_FILE.read_text(encoding="utf-8").split()
+    except OSError:
         return False
 
-    print("\n🎉 ¡Todas las dependencias están instaladas correctamente!")
-    return True
+def record_install(signature):
+    """Registrar la firma tras una instalación verificada."""
+    try:
+        with CACHE_FILE.open("a", encoding="utf-8") as f:
+            f.write(signature + "\n")
+    except OSError as e:
+        print(f"⚠️  No se pudo escribir la caché de instalación: {e}")
+
+def clear_install_cache():
+    """Borrar la caché de instalación (--clear-cache)."""
+    try:
+        CACHE_FILE.unlink()
+        print(f"🧹 Caché de instalación eliminada: {CACHE_FILE}")
+    except FileNotFoundError:
+        pass
+
+def print_next_steps():
+    """Mostrar los pasos siguientes tras una instalación correcta."""
+    print("\n🎯 Instalación completada exitosamente!")
+    print("\n📝 Próximos pasos:")
+    print("1. Ejecuta: python main.py")
+    print("2. Si tienes problemas, ejecuta: python test_app.py")
+    print("3. Consulta el README.md para más información")
 
 def main():
     """Función principal de instalación."""
     print("🚀 I2E - Instalador de Dependencias")
     print("=" * 50)
 
+    if "--clear-cache" in sys.argv[1:]:
+        clear_install_cache()
+
     # Verificaciones iniciales
     if not check_python_version():
         return 1
@@ -221,35 +350,59 @@ def main():
     if not check_pip():
         return 1
 
+    # Misma firma ya instalada: solo verificar
+    signature = install_signature()
+    if is_install_cached(signature):
+        print("\n⚡ Dependencias ya instaladas para este entorno (caché)")
+        if verify_installation():
+            print_next_steps()
+            return 0
+        print("⚠️  La verificación falló, se reinstalan las dependencias")
+
     # Actualizar pip
     upgrade_pip()
 
-    # Instalar dependencias
-    if not install_basic_dependencies():
+    # Con requirements.lock, las dependencias fijadas salen de una sola llamada
+    locked = install_locked_dependencies()
+    if locked is False:
+        print("❌ Error instalando desde requirements.lock")
+        return 1
+
+    # Instalar dependencias. Las básicas van primero y en serie: numpy/opencv
+    # también son dependencias transitivas de PaddlePaddle y no deben
+    # instalarse desde dos procesos pip a la vez.
+    if locked is None and not install_basic_dependencies():
         print("❌ Error instalando dependencias básicas")
         return 1
 
-    if not install_pyqt5():
+    # GUI, PaddleOCR y desarrollo (opcionales) son independientes entre sí:
+    # se lanzan en paralelo para solapar descargas y desempaquetado. PaddleOCR
+    # se lanza también con lock: paddlepaddle solo figura en requirements.txt
+    # para Windows (install_paddleocr no hace nada si ya está instalado).
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        gui_future = pool.submit(install_pyqt5)
+        paddle_future = pool.submit(install_paddleocr)
+        dev_future = pool.submit(install_dev_dependencies)
+
+        gui_ok = gui_future.result()
+        paddle_ok = paddle_future.result()
+        dev_future.result()
+
+    if not gui_ok:
         print("❌ Error instalando interfaz gráfica")
         return 1
 
-    if not install_paddleocr():
+    if not paddle_ok:
         print("❌ Error instalando PaddleOCR")
         return 1
 
-    # Dependencias de desarrollo (opcionales)
-    install_dev_dependencies()
-
     # Verificar instalación
     if not verify_installation():
         print("❌ Error en la verificación de dependencias")
         return 1
 
-    print("\n🎯 Instalación completada exitosamente!")
-    print("\n📝 Próximos pasos:")
-    print("1. Ejecuta: python main.py")
-    print("2. Si tienes problemas, ejecuta: python test_app.py")
-    print("3. Consulta el README.md para más información")
+    record_install(signature)
+    print_next_steps()
 
     return 0
 
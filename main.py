@@ -5,9 +5,11 @@ Punto de entrada para la aplicación de escritorio que convierte imágenes a Exc
 """
 
 from __future__ import annotations
+import argparse
 import sys
 import logging
-from pathlib import Path
+
+APP_VERSION = "2.0.0"
 
 # Configurar logging básico
 logging.basicConfig(
@@ -16,16 +18,32 @@ logging.basicConfig(
     datefmt="%H:%M:%S",
 )
 
+def parse_args(argv):
+    """Parsear la línea de comandos antes de importar nada pesado.
+
+    `--help`/`--version` terminan aquí sin cargar PyQt5 ni los motores OCR;
+    los argumentos desconocidos se dejan pasar a Qt.
+    """
+    parser = argparse.ArgumentParser(
+        prog="image2excel",
+        description="Convierte imágenes con texto o tablas a archivos Excel.",
+    )
+    parser.add_argument("--version", action="version", version=f"%(prog)s {APP_VERSION}")
+    _, qt_args = parser.parse_known_args(argv[1:])
+    return [argv[0], *qt_args]
+
+
 def main():
     """Función principal que inicia la aplicación GUI."""
+    qt_argv = parse_args(sys.argv)
     try:
         from PyQt5.QtWidgets import QApplication
         from gui.app_window import ImageToExcelApp
 
         # Crear aplicación Qt
-        app = QApplication(sys.argv)
+        app = QApplication(qt_argv)
         app.setApplicationName("Image2Excel")
-        app.setApplicationVersion("2.0.0")
+        app.setApplicationVersion(APP_VERSION)
         app.setOrganizationName("I2E Team")
 
         # Crear y mostrar ventana principal
@@ -1,11 +1,63 @@
 from __future__ import annotations
 from pathlib import Path
-from typing import List, Sequence, Any, Iterable
+from typing import List, Sequence, Any, Iterable, Iterator
+from xml.sax.saxutils import escape, quoteattr
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 import logging
+import re
+import zipfile
 
 logger = logging.getLogger("ExcelExporter")
 
+# Por encima de este nº de celdas (filas x ancho de la primera fila) el backend
+# openpyxl cede a un XLSX mínimo escrito a mano (sin objetos de openpyxl, memoria
+# de una fila). Todos los caminos escriben las celdas como texto literal.
+MINIMAL_XLSX_CELLS = 50_000
+
+# Caracteres de control no permitidos en XML 1.0
+_ILLEGAL_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+_CONTENT_TYPES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+_ROOT_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_WORKBOOK_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '</Relationships>'
+)
+_WORKBOOK_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name={name} sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_TAIL = '</sheetData></worksheet>'
+
 class ExcelExporter:
     """
     Exportador tolerante:
@@ -13,29 +65,54 @@ class ExcelExporter:
     - O una lista de listas de str
     """
 
-    def __init__(self, sheet_name: str = "Texto Extraído", include_confidence: bool = True) -> None:
+    BACKENDS = ("openpyxl", "xlsxwriter")
+
+    def __init__(
+        self,
+        sheet_name: str = "Texto Extraído",
+        include_confidence: bool = True,
+        backend: str = "openpyxl",
+    ) -> None:
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Backend Excel no soportado: {backend!r} (usa {', '.join(self.BACKENDS)})")
         self.sheet_name = sheet_name
         self.include_confidence = include_confidence
+        self.backend = backend
         logger.info(
-            "ExcelExporter inicializado con configuración: archivo=texto_extraido.xlsx, hoja=%s, incluir_confianza=%s",
-            self.sheet_name, self.include_confidence
+            "ExcelExporter inicializado con configuración: archivo=texto_extraido.xlsx, hoja=%s, incluir_confianza=%s, backend=%s",
+            self.sheet_name, self.include_confidence, self.backend
         )
 
     # ------------------ API pública ------------------
 
     def export_table(self, table_or_rows: Any, output_dir: str | Path, filename: str) -> str:
         try:
-            rows = self._to_rows(table_or_rows)
+            rows = self._iter_rows(table_or_rows)
             out_dir = Path(output_dir)
             out_dir.mkdir(parents=True, exist_ok=True)
             out_path = out_dir / filename
 
-            wb = Workbook()
-            ws = wb.active
-            ws.title = self.sheet_name
+            if self.backend == "xlsxwriter":
+                self._write_xlsxwriter(rows, out_path)
+                return str(out_path)
 
-            for r in rows or [[]]:
-                ws.append([str(c) for c in (list(r) if isinstance(r, (list, tuple)) else [r])])
+            if _grid_cells(table_or_rows) > MINIMAL_XLSX_CELLS:
+                self._export_minimal(rows, out_path)
+                return str(out_path)
+
+            # Modo write-only: filas volcadas en streaming, sin objetos Cell residentes
+            # (openpyxl serializa con lxml cuando está instalado)
+            wb = Workbook(write_only=True)
+            ws = wb.create_sheet(self.sheet_name)
+
+            # Cada fila se normaliza justo antes de escribirla: sin copia intermedia.
+            # El texto OCR que empieza por "=" se fija como cadena, no como fórmula.
+            written = False
+            for row in rows:
+                ws.append([_literal_cell(ws, v) if v[:1] == "=" else v for v in row])
+                written = True
+            if not written:
+                ws.append([])
 
             wb.save(out_path)
             return str(out_path)
@@ -45,33 +122,96 @@ class ExcelExporter:
 
     # ------------------ Helpers ------------------
 
-    def _to_rows(self, table_or_rows: Any) -> List[List[str]]:
+    def _write_xlsxwriter(self, rows: Iterable[List[str]], out_path: Path) -> None:
+        """
+        Backend xlsxwriter en modo memoria constante: cada fila se vuelca a disco
+        al escribir la siguiente. Solo texto plano, sin conversión a fórmulas/URLs/números.
+        """
+        import xlsxwriter  # type: ignore  # import diferido: solo con este backend
+
+        wb = xlsxwriter.Workbook(
+            str(out_path),
+            {
+                "constant_memory": True,
+                "strings_to_formulas": False,
+                "strings_to_urls": False,
+                "strings_to_numbers": False,
+            },
+        )
+        try:
+            ws = wb.add_worksheet(self.sheet_name)
+            for r_idx, row in enumerate(rows):
+                ws.write_row(r_idx, 0, row)
+        finally:
+            wb.close()
+
+    def _export_minimal(self, rows: Iterable[List[str]], out_path: Path) -> None:
+        """
+        Escribe un XLSX mínimo (content types, rels, workbook y una hoja) directamente
+        con zipfile. Cada fila se serializa como celdas inlineStr y se vuelca al ZIP
+        al momento: ni objetos de openpyxl ni tabla de cadenas compartidas.
         """
-        Normaliza la entrada a list[list[str]] aceptando:
+        with zipfile.ZipFile(out_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("[Content_Types].xml", _CONTENT_TYPES_XML)
+            zf.writestr("_rels/.rels", _ROOT_RELS_XML)
+            zf.writestr("xl/workbook.xml", _WORKBOOK_XML.format(name=quoteattr(self.sheet_name)))
+            zf.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS_XML)
+            with zf.open("xl/worksheets/sheet1.xml", "w") as sheet:
+                sheet.write(_SHEET_HEAD.encode("utf-8"))
+                for r_idx, row in enumerate(rows, start=1):
+                    cells = "".join(
+                        f'<c t="inlineStr"><is><t xml:space="preserve">{_xml_text(v)}</t></is></c>'
+                        for v in row
+                    )
+                    sheet.write(f'<row r="{r_idx}">{cells}</row>'.encode("utf-8"))
+                sheet.write(_SHEET_TAIL.encode("utf-8"))
+
+    def _iter_rows(self, table_or_rows: Any) -> Iterator[List[str]]:
+        """
+        Normaliza la entrada a filas list[str], una a una, aceptando:
         - Objeto con .rows -> cada fila puede tener .cells
         - list[list[str]]
+        El tipo se valida al llamar; las filas se generan bajo demanda.
         """
         # Caso Table del dominio (duck typing)
         if hasattr(table_or_rows, "rows"):
-            rows_attr = getattr(table_or_rows, "rows")
-            rows_out: List[List[str]] = []
-            for r in rows_attr:
-                if hasattr(r, "cells"):
-                    rows_out.append([str(c) for c in getattr(r, "cells")])
-                elif isinstance(r, (list, tuple)):
-                    rows_out.append([str(c) for c in r])
-                else:
-                    rows_out.append([str(r)])
-            return rows_out
+            return map(_row_from_table, getattr(table_or_rows, "rows"))
 
         # Caso lista directa
         if isinstance(table_or_rows, (list, tuple)):
-            rows_out: List[List[str]] = []
-            for r in table_or_rows:
-                if isinstance(r, (list, tuple)):
-                    rows_out.append([str(c) for c in r])
-                else:
-                    rows_out.append([str(r)])
-            return rows_out
+            return map(_row_from_list, table_or_rows)
 
         raise ValueError("El parámetro 'table' debe ser Table (.rows) o list[list[str]]")
+
+
+def _row_from_table(r: Any) -> List[str]:
+    if hasattr(r, "cells"):
+        return [str(c) for c in getattr(r, "cells")]
+    if isinstance(r, (list, tuple)):
+        return [str(c) for c in r]
+    return [str(r)]
+
+
+def _row_from_list(r: Any) -> List[str]:
+    if isinstance(r, (list, tuple)):
+        return [str(c) for c in r]
+    return [str(r)]
+
+
+def _grid_cells(table_or_rows: Any) -> int:
+    """Celdas estimadas como nº de filas x ancho de la primera fila (sin recorrer la tabla)."""
+    rows = getattr(table_or_rows, "rows", table_or_rows)
+    if not isinstance(rows, (list, tuple)) or not rows:
+        return 0
+    first = getattr(rows[0], "cells", rows[0])
+    return len(rows) * (len(first) if isinstance(first, (list, tuple)) else 1)
+
+
+def _literal_cell(ws: Any, value: str) -> WriteOnlyCell:
+    cell = WriteOnlyCell(ws, value=value)
+    cell.data_type = "s"
+    return cell
+
+
+def _xml_text(value: str) -> str:
+    return escape(_ILLEGAL_XML_CHARS.sub("", value))
@@ -0,0 +1,32 @@
+# services/instance_cache.py
+from __future__ import annotations
+import threading
+from typing import Callable, Dict, Generic, Hashable, List, TypeVar
+
+T = TypeVar("T")
+
+
+class InstanceCache(Generic[T]):
+    """Instancias compartidas por proceso, una por clave, creadas bajo demanda.
+
+    Pensada para motores OCR: cargar modelos cuesta segundos, así que la fábrica se
+    ejecuta dentro del lock y dos hilos con la misma clave no la cargan dos veces.
+    """
+
+    def __init__(self) -> None:
+        self._items: Dict[Hashable, T] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, factory: Callable[[], T]) -> T:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                item = self._items[key] = factory()
+            return item
+
+    def clear(self) -> List[T]:
+        """Vacía la caché y devuelve las instancias retiradas (para cerrarlas fuera del lock)."""
+        with self._lock:
+            items = list(self._items.values())
+            self._items.clear()
+        return items
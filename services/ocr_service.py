@@ -1,15 +1,21 @@
 # services/ocr_service.py
 from __future__ import annotations
 from pathlib import Path
-from typing import List
+from typing import Any, List
+
+from services.instance_cache import InstanceCache
+from services.paddle_ocr import paddle_words, tess_words
 
 try:
     import pytesseract  # type: ignore
-    from PIL import Image
     _HAS_TESS = True
 except Exception:
     _HAS_TESS = False
 
+# Instancias PaddleOCR compartidas por idioma entre todos los servicios del proceso:
+# el modelo se carga una sola vez aunque el servicio se cree por petición
+_PADDLE_CACHE: InstanceCache[Any] = InstanceCache()
+
 
 class PaddleOcrService:
     """
@@ -31,36 +37,17 @@ class PaddleOcrService:
         return self._extract_with_paddle_lazy(path, lang)
 
     def _extract_with_tesseract(self, image_path: str, lang: str) -> List[dict]:
-        img = Image.open(image_path)
-        data = pytesseract.image_to_data(img, lang=lang, output_type=pytesseract.Output.DICT)
-        words: List[dict] = []
-        n = len(data.get("text", []))
-        for i in range(n):
-            text = (data["text"][i] or "").strip()
-            if not text:
-                continue
-            try:
-                conf = float(data["conf"][i])
-            except Exception:
-                conf = 0.0
-            x, y, w, h = int(data["left"][i]), int(data["top"][i]), int(data["width"][i]), int(data["height"][i])
-            words.append({"text": text, "confidence": conf if conf >= 0 else 0.0, "bbox": [x, y, w, h]})
-        return words
+        # La ruta va directa a tesseract: sin decodificar con PIL ni re-codificar
+        data = pytesseract.image_to_data(image_path, lang=lang, output_type=pytesseract.Output.DICT)
+        return tess_words(data)
 
     def _extract_with_paddle_lazy(self, image_path: str, lang: str) -> List[dict]:
-        from paddleocr import PaddleOCR  # type: ignore
-        if self._paddle_ocr is None:
-            self._paddle_ocr = PaddleOCR(use_angle_cls=True, lang=lang, det=True, rec=True, show_log=False)
+        ocr = self._paddle_ocr = _PADDLE_CACHE.get(lang, lambda: _new_paddle(lang))
+
+        result = ocr.ocr(image_path, cls=True) or []
+        return paddle_words(result[0]) if result else []
+
 
-        result = self._paddle_ocr.ocr(image_path, cls=True) or []
-        words: List[dict] = []
-        if not result:
-            return words
-        for box, (text, conf) in result[0]:
-            xs = [int(pt[0]) for pt in box]
-            ys = [int(pt[1]) for pt in box]
-            x, y = min(xs), min(ys)
-            w = max(xs) - x
-            h = max(ys) - y
-            words.append({"text": text, "confidence": float(conf), "bbox": [x, y, w, h]})
-        return words
+def _new_paddle(lang: str) -> Any:
+    from paddleocr import PaddleOCR  # type: ignore
+    return PaddleOCR(use_angle_cls=True, lang=lang, det=True, rec=True, show_log=False)
@@ -5,10 +5,28 @@ OCR service: PRIORIDAD PaddleOCR (preciso). Fallback a Tesseract SOLO si el ejec
 """
 from __future__ import annotations
 from pathlib import Path
-from typing import List
+from typing import Any, Iterable, Iterator, List, Sequence, Tuple
 import os
+import queue
+import sys
+import threading
+import time
 from shutil import which
 
+# --- Límites de ejecución ---
+
+# Reintentos con backoff exponencial ante fallos transitorios (memoria, CUDA).
+# La concurrencia se limita por servicio: el predictor de Paddle no es thread-safe.
+_MAX_RETRIES = 3
+_BACKOFF_INITIAL_S = 0.5
+_BACKOFF_MAX_S = 4.0
+_TRANSIENT_MARKERS = ("out of memory", "resourceexhausted", "cuda error", "cudnn_status")
+
+# Recortes con desviación típica menor se consideran celdas en blanco
+_BLANK_STD = 5.0
+
+_DONE = object()  # centinela de fin de lectura en extract_words_stream
+
 # --- Utils ---
 
 def _paddle_lang(lang: str) -> str:
@@ -18,31 +36,164 @@ def _paddle_lang(lang: str) -> str:
         return "latin"
     return lang
 
+def onnx_model_kwargs(model_dir: str | None) -> dict:
+    """Parámetros para ejecutar det/rec/cls exportados a ONNX (ver tools/export_onnx_models.py).
+
+    PaddleOCR 2.x ejecuta estos modelos con ONNX Runtime cuando `use_onnx=True`.
+    Si existe `rec.int8.onnx` (reconocedor cuantizado) se prefiere al FP32.
+    Compartido con `PaddleOcrEngine`.
+    """
+    if not model_dir:
+        return {}
+    base = Path(model_dir)
+    rec = base / "rec.int8.onnx"
+    if not rec.is_file():
+        rec = base / "rec.onnx"
+    return {
+        "use_onnx": True,
+        "det_model_dir": str(base / "det.onnx"),
+        "rec_model_dir": str(rec),
+        "cls_model_dir": str(base / "cls.onnx"),
+    }
+
+def _default_batch_num() -> int:
+    # En CPU predictor.run() procesa el lote en serie: lote 1 evita que Paddle reserve
+    # memoria para lotes grandes. Solo en builds con CUDA compensa agrupar.
+    paddle = sys.modules.get("paddle")
+    try:
+        return 6 if paddle is not None and paddle.device.is_compiled_with_cuda() else 1
+    except Exception:
+        return 1
+
 def _tesseract_available() -> bool:
     # Evita llamar a pytesseract si no existe el ejecutable
     return bool(which("tesseract") or os.getenv("TESSERACT_CMD"))
 
+def _is_blank(crop) -> bool:
+    # Desviación típica de intensidad bajo el umbral -> sin trazos que reconocer
+    return crop.size == 0 or float(crop.std()) < _BLANK_STD
+
+def _is_transient(err: Exception) -> bool:
+    if isinstance(err, MemoryError):
+        return True
+    msg = str(err).lower()
+    return any(marker in msg for marker in _TRANSIENT_MARKERS)
+
 # --- Servicio ---
 
 class PaddleOcrService:
     """Servicio OCR preferentemente con PaddleOCR, fallback a Tesseract si está disponible."""
 
-    def __init__(self, lang_default: str = "es") -> None:
+    def __init__(
+        self,
+        lang_default: str = "es",
+        *,
+        enable_mkldnn: bool = True,
+        cpu_threads: int | None = None,
+        onnx_model_dir: str | None = None,
+        use_tensorrt: bool = False,
+        precision: str = "fp32",
+        rec_batch_num: int | None = None,
+        cls_batch_num: int | None = None,
+    ) -> None:
         self._lang_default = lang_default
         self._paddle = None  # instancia de PaddleOCR (lazy)
+        self._paddle_lock = threading.Lock()  # una inferencia a la vez por instancia
+        # Backend acelerado de CPU (MKL-DNN/oneDNN) con todos los núcleos por defecto:
+        # cada servicio atiende una inferencia a la vez.
+        self._enable_mkldnn = enable_mkldnn
+        self._cpu_threads = cpu_threads or os.cpu_count() or 1
+        # Carpeta con det.onnx/rec.onnx/cls.onnx: inferencia con ONNX Runtime
+        self._onnx_model_dir = onnx_model_dir or os.getenv("I2E_ONNX_MODEL_DIR") or None
+        # TensorRT en GPU con la precisión indicada. Sin TensorRT no se pasa: en CPU
+        # Paddle 2.x activaría bf16 de MKL-DNN con precision="fp16"
+        self._use_tensorrt = use_tensorrt
+        self._precision = precision
+        # None -> 1 en CPU, 6 con CUDA (ver _default_batch_num)
+        self._rec_batch_num = rec_batch_num
+        self._cls_batch_num = cls_batch_num
 
     def extract_words(self, image_path: str, lang: str | None = None) -> List[dict]:
-        img_path = str(Path(image_path))
+        return self._extract(str(Path(image_path)), lang or self._lang_default)
+
+    def extract_words_stream(
+        self,
+        image_paths: Iterable[str],
+        lang: str | None = None,
+        prefetch: int = 4,
+    ) -> Iterator[List[dict]]:
+        """OCR de varias imágenes en el hilo llamante, con lectura/decodificación anticipada.
+
+        Un hilo lector decodifica las imágenes siguientes (cv2.imread) en una cola
+        acotada mientras Paddle infiere la actual; la inferencia nativa libera el GIL,
+        así que ambas etapas se solapan sin procesos. Produce las palabras de cada
+        imagen en el orden de entrada.
+        """
+        import cv2  # type: ignore
+
         lang = lang or self._lang_default
+        images: queue.Queue = queue.Queue(maxsize=max(1, prefetch))
+        stop = threading.Event()
+        errors: List[BaseException] = []
+
+        def load() -> None:
+            try:
+                for path in image_paths:
+                    if stop.is_set():
+                        break
+                    path = str(Path(path))
+                    image = cv2.imread(path)
+                    # Ilegible para cv2: se pasa la ruta y el error lo da el OCR
+                    images.put(path if image is None else image)
+            except BaseException as e:  # se relanza en el hilo llamante
+                errors.append(e)
+            finally:
+                images.put(_DONE)
+
+        loader = threading.Thread(target=load, name="i2e-ocr-load", daemon=True)
+        loader.start()
+        try:
+            while (image := images.get()) is not _DONE:
+                yield self._extract(image, lang)
+        finally:
+            stop.set()
+            while image is not _DONE:  # drenar para desbloquear al lector
+                image = images.get()
+            loader.join()
+        if errors:
+            raise errors[0]
+
+    def recognize_crops(self, crops: Sequence[Any], lang: str | None = None) -> List[Tuple[str, float]]:
+        """Reconoce el texto de varios recortes (ndarrays BGR) en una sola llamada.
+
+        Solo reconocimiento (`det=False`). Los recortes se pasan como una única
+        lista anidada: PaddleOCR 2.7 trata cada elemento de la lista externa como una
+        imagen, pero una lista interna llega entera al reconocedor, que la procesa
+        en lotes de `rec_batch_num`. Los recortes en blanco se resuelven como ("", 0.0) sin llamar al modelo.
+        Devuelve un `(texto, confianza)` por recorte, en el mismo orden.
+        """
+        # Recortes casi uniformes (celdas en blanco) no pasan por el modelo
+        out: List[Tuple[str, float]] = [("", 0.0)] * len(crops)
+        pending = [i for i, crop in enumerate(crops) if not _is_blank(crop)]
+        if not pending:
+            return out
+        self._ensure_paddle(_paddle_lang(lang or self._lang_default))
+        assert self._paddle is not None
+        result = self._run_paddle([[crops[i] for i in pending]], det=False, cls=False)
+        rec = result[0] if result else []  # un (texto, confianza) por recorte
+        for i, (text, conf) in zip(pending, rec):
+            out[i] = (text, float(conf))
+        return out
 
+    def _extract(self, image: Any, lang: str) -> List[dict]:
         # 1) Intentar SIEMPRE PaddleOCR primero
         try:
-            return self._extract_with_paddle(img_path, _paddle_lang(lang))
+            return self._extract_with_paddle(image, _paddle_lang(lang))
         except Exception as paddle_err:
             # 2) Si hay Tesseract disponible (ejecutable), usar fallback
             if _tesseract_available():
                 try:
-                    return self._extract_with_tesseract(img_path, lang)
+                    return self._extract_with_tesseract(image, lang)
                 except Exception as tess_err:
                     raise RuntimeError(
                         "PaddleOCR falló y el fallback Tesseract también falló."
@@ -53,6 +204,16 @@ class PaddleOcrService:
                 "Soluciones: (a) corrige Paddle (ver logs), o (b) instala Tesseract y añade al PATH."
             ) from paddle_err
 
+    def close(self) -> None:
+        """Libera el motor PaddleOCR y, si Paddle está cargado, su caché de GPU."""
+        self._paddle = None
+        paddle = sys.modules.get("paddle")
+        if paddle is not None:
+            try:
+                paddle.device.cuda.empty_cache()
+            except Exception:
+                pass  # build sin CUDA o API no disponible
+
     # ----------------- Implementaciones -----------------
 
     def _ensure_paddle(self, lang: str) -> None:
@@ -60,47 +221,86 @@ class PaddleOcrService:
             return
         # Import lazy para no romper en import-time
         from paddleocr import PaddleOCR  # type: ignore
+        batch_num = _default_batch_num()
         self._paddle = PaddleOCR(
             use_angle_cls=True,
             lang=lang,
             det=True,
             rec=True,
             show_log=False,
+            enable_mkldnn=self._enable_mkldnn,
+            cpu_threads=self._cpu_threads,
+            rec_batch_num=self._rec_batch_num or batch_num,
+            cls_batch_num=self._cls_batch_num or batch_num,
+            **onnx_model_kwargs(self._onnx_model_dir),
+            **({"use_tensorrt": True, "precision": self._precision} if self._use_tensorrt else {}),
         )
 
-    def _extract_with_paddle(self, image_path: str, lang: str) -> List[dict]:
+    def _extract_with_paddle(self, image: Any, lang: str) -> List[dict]:
         self._ensure_paddle(lang)
         assert self._paddle is not None
-        result = self._paddle.ocr(image_path, cls=True) or []
-        words: List[dict] = []
-        if not result:
-            return words
-        for box, (text, conf) in result[0]:
-            xs = [int(pt[0]) for pt in box]
-            ys = [int(pt[1]) for pt in box]
-            x, y = min(xs), min(ys)
-            w, h = max(xs) - x, max(ys) - y
-            words.append({"text": text, "confidence": float(conf), "bbox": [x, y, w, h]})
-        return words
-
-    def _extract_with_tesseract(self, image_path: str, lang: str) -> List[dict]:
+        result = self._run_paddle(image)
+        return paddle_words(result[0]) if result else []
+
+    def _run_paddle(self, image: Any, **ocr_kwargs: Any) -> list:
+        """Invoca PaddleOCR en exclusiva y con reintentos ante fallos transitorios."""
+        ocr_kwargs.setdefault("cls", True)
+        backoff = _BACKOFF_INITIAL_S
+        for attempt in range(1, _MAX_RETRIES + 1):
+            try:
+                with self._paddle_lock:
+                    return self._paddle.ocr(image, **ocr_kwargs) or []
+            except Exception as err:
+                if attempt == _MAX_RETRIES or not _is_transient(err):
+                    raise
+                time.sleep(backoff)
+                backoff = min(_BACKOFF_MAX_S, backoff * 2)
+
+    def _extract_with_tesseract(self, image: Any, lang: str) -> List[dict]:
         # Importar dentro (evita dependencia si no se usa)
         import pytesseract  # type: ignore
-        from PIL import Image
-
-        img = Image.open(image_path)
-        data = pytesseract.image_to_data(img, lang=lang, output_type=pytesseract.Output.DICT)
-        words: List[dict] = []
-        n = len(data.get("text", []))
-        for i in range(n):
-            text = (data["text"][i] or "").strip()
-            if not text:
-                continue
-            try:
-                conf = float(data["conf"][i])
-            except Exception:
-                conf = 0.0
-            x = int(data["left"][i]); y = int(data["top"][i])
-            w = int(data["width"][i]); h = int(data["height"][i])
-            words.append({"text": text, "confidence": conf if conf >= 0 else 0.0, "bbox": [x, y, w, h]})
-        return words
+
+        # Ruta en disco o ndarray: pytesseract pasa la ruta tal cual al ejecutable
+        # (decodifica Leptonica), sin abrir con PIL ni re-codificar a un temporal
+        data = pytesseract.image_to_data(image, lang=lang, output_type=pytesseract.Output.DICT)
+        return tess_words(data)
+
+
+def tess_words(data: dict) -> List[dict]:
+    """Palabras no vacías de `image_to_data(..., output_type=DICT)` con bbox [x, y, w, h]."""
+    # Iteración paralela sobre las columnas: sin indexar el dict por palabra
+    columns = (data.get(k, ()) for k in ("text", "conf", "left", "top", "width", "height"))
+    return [
+        {"text": text, "confidence": tess_conf(c), "bbox": [int(x), int(y), int(w), int(h)]}
+        for t, c, x, y, w, h in zip(*columns)
+        if (text := (t or "").strip())
+    ]
+
+
+def tess_conf(value: Any) -> float:
+    """Confianza de Tesseract como float >= 0 (-1 o valores no numéricos -> 0.0)."""
+    try:
+        conf = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return conf if conf >= 0 else 0.0
+
+
+def paddle_words(lines: Any) -> List[dict]:
+    """Convierte las líneas de PaddleOCR a palabras con bbox [x, y, w, h].
+
+    Los polígonos de todas las líneas se reducen de una vez como array (n, 4, 2)
+    en lugar de construir listas xs/ys y aplicar min/max en Python por palabra.
+    """
+    if not lines:
+        return []
+    import numpy as np
+
+    boxes = np.asarray([box for box, _ in lines], dtype=np.float64).astype(np.int32)
+    mins = boxes.min(axis=1)
+    sizes = boxes.max(axis=1) - mins
+    return [
+        {"text": text, "confidence": float(conf), "bbox": [x, y, w, h]}
+        for (_, (text, conf)), (x, y), (w, h) in zip(lines, mins.tolist(), sizes.tolist())
+    ]
+
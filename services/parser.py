@@ -21,6 +21,8 @@ from infrastructure.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+_RE_WHITESPACE = re.compile(r'\s+')
+
 
 @dataclass
 class ParsingConfig:
@@ -83,8 +85,9 @@ class TableParser:
         self.config = config or ParsingConfig()
         self.logger = get_logger(self.__class__.__name__)
 
-        # Compilar regex para separadores
+        # Compilar regex para separadores (una sola vez por parser)
         self._separator_patterns = self._compile_separators()
+        self._patterns_by_source = {p.pattern: p for p in self._separator_patterns}
 
         self.logger.info(
             "TableParser inicializado con configuración: "
@@ -146,9 +149,11 @@ class TableParser:
 
             # Calcular métricas finales
             metrics.processed_lines = len(rows)
-            metrics.detected_columns = self._count_columns(rows)
+            # Una sola pasada por las filas para columnas y estadísticas de celdas
+            row_stats = self._scan_rows(rows)
+            metrics.detected_columns = row_stats[0]
             metrics.parsing_time = time.time() - start_time
-            metrics.confidence_score = self._calculate_confidence_score(rows, ocr.lines)
+            metrics.confidence_score = self._calculate_confidence_score(rows, ocr.lines, row_stats)
 
             self.logger.info(
                 "Parseo completado: %d filas, %d columnas, tiempo=%.3fs, "
@@ -191,11 +196,13 @@ class TableParser:
             return lines
 
         filtered = []
+        # Trazas por línea solo si DEBUG está activo (evita LogRecord por línea)
+        debug = self.logger.isEnabledFor(logging.DEBUG)
         for line in lines:
             if hasattr(line, 'confidence') and line.confidence is not None:
                 if line.confidence >= self.config.min_confidence_threshold:
                     filtered.append(line)
-                else:
+                elif debug:
                     self.logger.debug(
                         "Línea filtrada por baja confianza (%.2f): '%s'",
                         line.confidence, line.text[:50]
@@ -325,6 +332,7 @@ class TableParser:
             Filas de tabla parseadas
         """
         rows = []
+        debug = self.logger.isEnabledFor(logging.DEBUG)
 
         for i, line in enumerate(lines):
             try:
@@ -345,10 +353,11 @@ class TableParser:
                     row = TableRow(cells=table_cells)
                     rows.append(row)
 
-                    self.logger.debug(
-                        "Fila %d parseada: %d celdas, texto='%s...'",
-                        i + 1, len(table_cells), text[:50]
-                    )
+                    if debug:
+                        self.logger.debug(
+                            "Fila %d parseada: %d celdas, texto='%s...'",
+                            i + 1, len(table_cells), text[:50]
+                        )
 
             except Exception as e:
                 error_msg = f"Error parseando línea {i + 1}: {str(e)}"
@@ -383,36 +392,21 @@ class TableParser:
 
         # Limpiar texto si está habilitado
         if self.config.remove_extra_spaces:
-            text = re.sub(r'\s+', ' ', text)
+            text = _RE_WHITESPACE.sub(' ', text)
 
         if self.config.normalize_whitespace:
             text = ' '.join(text.split())
 
         # Intentar dividir usando el separador principal si está disponible
-        if structure and structure.get('main_separator'):
-            separator = structure['main_separator']
-            if separator == r'\t+':
-                columns = re.split(r'\t+', text)
-            elif separator == r'\s{2,}':
-                columns = re.split(r'\s{2,}', text)
-            else:
-                # Escapar caracteres especiales
-                escaped = re.escape(separator.replace('+', ''))
-                columns = re.split(f'{escaped}+', text)
+        main_separator = structure.get('main_separator') if structure else None
+        if main_separator:
+            pattern = self._patterns_by_source.get(main_separator) or re.compile(main_separator)
+            columns = pattern.split(text)
         else:
             # Fallback: usar todos los separadores disponibles
             columns = [text]
             for pattern in self._separator_patterns:
-                new_columns = []
-                for col in columns:
-                    if pattern.pattern == r'\t+':
-                        new_columns.extend(re.split(r'\t+', col))
-                    elif pattern.pattern == r'\s{2,}':
-                        new_columns.extend(re.split(r'\s{2,}', col))
-                    else:
-                        escaped = re.escape(pattern.pattern.replace('+', ''))
-                        new_columns.extend(re.split(f'{escaped}+', col))
-                columns = new_columns
+                columns = [part for col in columns for part in pattern.split(col)]
 
         # Filtrar columnas vacías y muy cortas
         filtered_columns = [
@@ -422,16 +416,23 @@ class TableParser:
 
         return filtered_columns
 
-    def _count_columns(self, rows: List[TableRow]) -> int:
-        """Contar el número máximo de columnas en las filas."""
-        if not rows:
-            return 0
-        return max(len(row.cells) for row in rows)
+    @staticmethod
+    def _scan_rows(rows: List[TableRow]) -> Tuple[int, int, int]:
+        """Máximo de columnas, total de celdas y suma de cuadrados en una pasada."""
+        max_cols = total = sum_sq = 0
+        for row in rows:
+            n = len(row.cells)
+            total += n
+            sum_sq += n * n
+            if n > max_cols:
+                max_cols = n
+        return max_cols, total, sum_sq
 
     def _calculate_confidence_score(
         self,
         rows: List[TableRow],
-        original_lines: List[Any]
+        original_lines: List[Any],
+        row_stats: Optional[Tuple[int, int, int]] = None
     ) -> float:
         """
         Calcular score de confianza basado en la calidad del parseo.
@@ -442,6 +443,8 @@ class TableParser:
             Filas parseadas
         original_lines : List[Any]
             Líneas originales del OCR
+        row_stats : Optional[Tuple[int, int, int]]
+            Resultado de `_scan_rows(rows)` si ya se calculó
 
         Returns
         -------
@@ -452,19 +455,18 @@ class TableParser:
             return 0.0
 
         # Calcular métricas de calidad
-        total_cells = sum(len(row.cells) for row in rows)
-        avg_cells_per_row = total_cells / len(rows) if rows else 0
+        _, total_cells, sum_sq = row_stats or self._scan_rows(rows)
+        n_rows = len(rows)
+        avg_cells_per_row = total_cells / n_rows
 
         # Factor de completitud (cuántas líneas se procesaron)
-        completeness = len(rows) / len(original_lines) if original_lines else 0
+        completeness = n_rows / len(original_lines)
 
-        # Factor de consistencia (variación en número de columnas)
-        column_counts = [len(row.cells) for row in rows]
-        if column_counts:
-            std_dev = (sum((x - avg_cells_per_row) ** 2 for x in column_counts) / len(column_counts)) ** 0.5
-            consistency = max(0, 1 - (std_dev / avg_cells_per_row)) if avg_cells_per_row > 0 else 0
-        else:
-            consistency = 0
+        # Factor de consistencia (variación en número de columnas):
+        # varianza = E[x²] - E[x]², sin segunda pasada por las filas
+        variance = max(0.0, sum_sq / n_rows - avg_cells_per_row ** 2)
+        std_dev = variance ** 0.5
+        consistency = max(0, 1 - (std_dev / avg_cells_per_row)) if avg_cells_per_row > 0 else 0
 
         # Score final ponderado
         confidence = (completeness * 0.4 + consistency * 0.6)
@@ -16,3 +16,164 @@ def test_end_to_end(tmp_path: Path):
 
     assert out.exists()
     assert out.suffix == ".xlsx"
+
+
+def test_batch_pipeline_preserves_order(tmp_path: Path):
+    from image2excel.ports import OcrWord
+    from image2excel.use_cases import RunImagesToExcel
+
+    class FakeOcr:
+        def extract_words(self, image_path: Path, lang: str):
+            return [OcrWord(text=image_path.stem, confidence=1.0, x=0, y=0, w=10, h=10)]
+
+    use_case = RunImagesToExcel(FakeOcr(), BasicParserAdapter(), OpenpyxlExporterAdapter(), queue_size=1)
+    paths = [Path(f"img{i}.png") for i in range(5)]
+    outs = use_case(paths, tmp_path, RunImageToExcelConfig(output_filename="out.xlsx"))
+
+    assert [o.name for o in outs] == [f"img{i}_out.xlsx" for i in range(5)]
+    assert all(o.exists() for o in outs)
+
+
+class _FakePaddle27:
+    """Imita `PaddleOCR.ocr(..., det=False)` de paddleocr 2.7: un resultado por
+    elemento de la lista externa; una lista interna se reconoce como un lote."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def ocr(self, imgs, det=True, cls=True):
+        out = []
+        for img in imgs:
+            batch = img if isinstance(img, list) else [img]
+            self.calls += 1
+            out.append([(f"t{int(crop[0, 0, 0])}", 0.9) for crop in batch])
+        return out
+
+
+def test_recognize_crops_reads_every_crop_in_one_batch():
+    import numpy as np
+    from services.paddle_ocr import PaddleOcrService
+
+    def crop(marker: int):
+        img = np.zeros((8, 8, 3), dtype=np.uint8)
+        img[:, 4:] = 255  # trazos: no cuenta como celda en blanco
+        img[0, 0, 0] = marker
+        return img
+
+    svc = PaddleOcrService()
+    svc._paddle = fake = _FakePaddle27()
+    blank = np.full((8, 8, 3), 255, dtype=np.uint8)
+
+    result = svc.recognize_crops([crop(0), blank, crop(2), crop(3)])
+
+    assert result == [("t0", 0.9), ("", 0.0), ("t2", 0.9), ("t3", 0.9)]
+    assert fake.calls == 1
+
+
+def test_minimal_xlsx_writer_round_trips(tmp_path: Path, monkeypatch):
+    from openpyxl import load_workbook
+    import services.exporter as exporter_mod
+
+    monkeypatch.setattr(exporter_mod, "MINIMAL_XLSX_CELLS", 0)  # forzar el escritor mínimo
+    rows = [["<a> & \"b\"", " espacios "], [], ["ctrl\x01\x1fok", "=SUMA(A1)"]]
+    out = exporter_mod.ExcelExporter(sheet_name='Hoja "1" & <2>').export_table(rows, tmp_path, "min.xlsx")
+
+    ws = load_workbook(out).active
+    assert ws.title == 'Hoja "1" & <2>'
+    assert [list(r) for r in ws.iter_rows(values_only=True)] == [
+        ["<a> & \"b\"", " espacios "],
+        [None, None],
+        ["ctrlok", "=SUMA(A1)"],
+    ]
+
+
+
+def _word(text: str, x: int, y: int, h: int = 20):
+    from image2excel.ports import OcrWord
+    return OcrWord(text=text, confidence=1.0, x=x, y=y, w=40, h=h)
+
+
+def test_basic_parser_keeps_skewed_row_together():
+    # 12 palabras en una línea, cada una 3 px más baja que la anterior (umbral 10)
+    words = [_word(str(i), 50 * i, 100 + 3 * i) for i in range(12)]
+
+    table = BasicParserAdapter().words_to_table(words)
+
+    assert [row.cells for row in table.rows] == [[str(i) for i in range(12)]]
+
+
+def test_basic_parser_aligns_tall_word_by_center():
+    # "T" es alta y empieza 15 px por encima de su fila (umbral 13): por el borde
+    # superior se partiría la fila; por el centro vertical queda con "a" y "b".
+    words = [
+        _word("a", 0, 100), _word("T", 50, 85, h=40), _word("b", 100, 100),
+        _word("c", 0, 140), _word("d", 50, 141),
+    ]
+
+    table = BasicParserAdapter().words_to_table(words)
+
+    assert [row.cells for row in table.rows] == [["a", "T", "b"], ["c", "d"]]
+
+
+def test_domain_table_rows_compat_view():
+    from image2excel.domain.models import Cell, Table, TableRow
+
+    legacy = Table(rows=[TableRow(cells=[Cell("a", 0.9), Cell("b")])])
+    assert legacy.grid == [["a", "b"]]
+    assert legacy.confidences == [[0.9, None]]
+
+    table = Table.from_grid([["x", "y"]])
+    assert [[c.text for c in row.cells] for row in table.rows] == [["x", "y"]]
+    assert table.rows is table.rows
+
+
+def test_exporter_writes_formula_like_text_as_string_on_both_writers(tmp_path: Path, monkeypatch):
+    from openpyxl import load_workbook
+    import services.exporter as exporter_mod
+
+    rows = [["=1+1", "texto"], ["=SUMA(A1)", ""]]
+    for name, threshold in (("small.xlsx", 10**9), ("large.xlsx", 0)):
+        monkeypatch.setattr(exporter_mod, "MINIMAL_XLSX_CELLS", threshold)
+        out = exporter_mod.ExcelExporter().export_table(rows, tmp_path, name)
+        cells = [c for row in load_workbook(out).active.iter_rows() for c in row]
+        assert [c.value for c in cells[:3]] == ["=1+1", "texto", "=SUMA(A1)"]
+        assert all(c.data_type == "s" for c in cells if c.value is not None)
+
+
+def test_extract_words_stream_order_close_and_errors(monkeypatch):
+    import sys
+    import threading
+    import types
+    import pytest
+    import services.paddle_ocr as paddle_mod
+
+    fake_cv2 = types.SimpleNamespace(imread=lambda p: None if p.endswith("bad") else f"img:{p}")
+    monkeypatch.setitem(sys.modules, "cv2", fake_cv2)
+    monkeypatch.setattr(paddle_mod, "_tesseract_available", lambda: False)
+
+    class FakePaddle:
+        def ocr(self, image, cls=True):
+            if not image.startswith("img:"):  # cv2 no pudo leerla: llega la ruta
+                raise ValueError(f"imagen ilegible: {image}")
+            return [[([[0, 0], [10, 0], [10, 10], [0, 10]], (image, 0.9))]]
+
+    svc = paddle_mod.PaddleOcrService()
+    svc._paddle = FakePaddle()
+
+    def texts(words):
+        return [w["text"] for w in words]
+
+    # Orden de entrada conservado
+    assert [texts(w) for w in svc.extract_words_stream(["a", "b", "c"])] == [["img:a"], ["img:b"], ["img:c"]]
+
+    # Cierre anticipado: el lector termina (cola drenada)
+    stream = svc.extract_words_stream([str(i) for i in range(50)], prefetch=1)
+    assert texts(next(stream)) == ["img:0"]
+    stream.close()
+    assert not any(t.name == "i2e-ocr-load" for t in threading.enumerate())
+
+    # Imagen ilegible: error al llegar a ese elemento, tras los anteriores
+    stream = svc.extract_words_stream(["a", "x.bad", "c"])
+    assert texts(next(stream)) == ["img:a"]
+    with pytest.raises(RuntimeError):
+        next(stream)
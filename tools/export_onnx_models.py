@@ -0,0 +1,53 @@
+# tools/export_onnx_models.py
+"""Exporta los modelos det/rec/cls de PaddleOCR a ONNX con paddle2onnx.
+
+Uso:
+    pip install paddle2onnx onnxruntime
+    python tools/export_onnx_models.py --det <dir> --rec <dir> --cls <dir> --out models/onnx [--int8-rec]
+
+Cada <dir> es una carpeta de inferencia de Paddle (inference.pdmodel + inference.pdiparams),
+p.ej. las que PaddleOCR descarga en ~/.paddleocr/whl/. Con --int8-rec se genera además
+rec.int8.onnx (cuantización dinámica INT8 del reconocedor), que el motor usa si existe. Después:
+    I2E_ONNX_MODEL_DIR=models/onnx python main.py
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--det", required=True, type=Path, help="Modelo de detección (Paddle)")
+parser.add_argument("--rec", required=True, type=Path, help="Modelo de reconocimiento (Paddle)")
+parser.add_argument("--cls", required=True, type=Path, help="Clasificador de ángulo (Paddle)")
+parser.add_argument("--out", default=Path("models/onnx"), type=Path, help="Carpeta de salida")
+parser.add_argument("--opset", default=11, type=int, help="Versión de opset ONNX")
+parser.add_argument("--int8-rec", action="store_true", help="Cuantizar el reconocedor a INT8")
+args = parser.parse_args()
+
+args.out.mkdir(parents=True, exist_ok=True)
+
+for name, model_dir in (("det", args.det), ("rec", args.rec), ("cls", args.cls)):
+    save_file = args.out / f"{name}.onnx"
+    cmd = [
+        "paddle2onnx",
+        "--model_dir", str(model_dir),
+        "--model_filename", "inference.pdmodel",
+        "--params_filename", "inference.pdiparams",
+        "--save_file", str(save_file),
+        "--opset_version", str(args.opset),
+        "--enable_onnx_checker", "True",
+    ]
+    print(f"🔧 Exportando {name}: {model_dir} -> {save_file}")
+    if subprocess.run(cmd).returncode != 0:
+        print(f"❌ Falló la exportación de {name}")
+        sys.exit(1)
+
+if args.int8_rec:
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    rec_fp32 = args.out / "rec.onnx"
+    rec_int8 = args.out / "rec.int8.onnx"
+    print(f"🔧 Cuantizando reconocedor a INT8: {rec_fp32} -> {rec_int8}")
+    quantize_dynamic(str(rec_fp32), str(rec_int8), weight_type=QuantType.QInt8)
+
+print(f"✅ Modelos ONNX en: {args.out.resolve()}")